@@ -0,0 +1,64 @@
+"""Per-request cost of verifying the bearer token, before and after caching.
+
+    python -m benchmarks.bench_auth --requests 100000 --users 100
+
+"before" verifies the token's signature with `jwt.decode` on every request, as
+the auth dependencies used to. "after" goes through `token_cache`, which checks
+each token once per worker. Requests are spread over `--users` distinct tokens.
+"""
+import argparse
+import time
+
+import jwt
+
+from src.config import Config
+from src.user.utils.cache import TokenCache
+from src.user.utils.deps import _authenticated
+
+
+def make_tokens(users: int) -> list:
+    exp = time.time() + 3600
+    return [
+        jwt.encode(
+            {"id": f"user-{i}", "role": "user", "exp": exp},
+            key=Config.JWT_SECRET_KEY,
+            algorithm=Config.JWT_ALGORITHM,
+        )
+        for i in range(users)
+    ]
+
+
+def report(label: str, requests: int, seconds: float):
+    print(f"{label:<28} {seconds / requests * 1e6:>8.2f} us/request  ({seconds:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.users)
+    stream = [tokens[i % len(tokens)] for i in range(args.requests)]
+
+    start = time.perf_counter()
+    for token in stream:
+        jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
+    report("before (jwt.decode)", args.requests, time.perf_counter() - start)
+
+    cache = TokenCache()
+    start = time.perf_counter()
+    for token in stream:
+        cache.decode(token)
+    report("after (token cache)", args.requests, time.perf_counter() - start)
+    print(f"{'':<28} {cache.stats()}")
+
+    headers = [f"Bearer {token}" for token in stream]
+    start = time.perf_counter()
+    for header in headers:
+        _authenticated(header)
+    report("after (_authenticated)", args.requests, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
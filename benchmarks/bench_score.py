@@ -0,0 +1,111 @@
+"""Session scoring throughput, before and after batching.
+
+    python -m benchmarks.bench_score --sessions 200 --turns 10
+
+"before" scores every utterance with its own `nlp()` call on the full
+en_core_web_sm pipeline and a word tokenizer, as `calculate_score` used to. nltk
+is no longer a dependency: its `word_tokenize` is used when installed, otherwise
+a regex stand-in (cheaper than nltk, so it flatters the baseline). "after" is the current `calculate_score`
+(one tokenizer pass, vectorized rubric) run inline, through `scoring_engine`
+with every session closing at once, and over all sessions in one batch.
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+
+import spacy
+
+from src.conversation.utils.nlp import models
+from src.conversation.utils.score import calculate_score, score_sessions, scoring_engine
+
+try:
+    from nltk.tokenize import word_tokenize
+except ImportError:
+    WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+    def word_tokenize(text: str) -> list:
+        return WORD_PATTERN.findall(text)
+
+
+WORDS = "I think travel is really interesting because you meet new people and see places".split()
+
+
+def make_sessions(sessions: int, turns: int) -> list:
+    rng = random.Random(0)
+    return [
+        (
+            [
+                " ".join(rng.choices(WORDS, k=rng.randint(3, 25))) + rng.choice(".?!")
+                for _ in range(turns)
+            ],
+            [rng.random() for _ in range(turns)],
+        )
+        for _ in range(sessions)
+    ]
+
+
+def legacy_calculate_score(nlp, user_content: list, stt_confidences: list) -> tuple:
+    total_score = 0
+    total_words = 0
+    for i, user_input in enumerate(user_content):
+        words = word_tokenize(user_input)
+        total_words += len(words)
+        doc = nlp(user_input)
+        total_score += (
+            2 if all(token.is_alpha or token.is_punct for token in doc) else 1
+        )
+        total_score += 2 if len(user_input.split()) > 3 else 1
+        total_score += 2 if "?" in user_input or len(user_input.split()) > 5 else 1
+        total_score += 2 if len(words) > 3 else 1
+        total_score += 2 if stt_confidences[i] > 0.8 else 1
+    avg_score = round(total_score / len(user_content), 2) if user_content else 0
+    return avg_score, total_words
+
+
+def report(label: str, utterances: int, seconds: float):
+    print(f"{label:<28} {utterances / seconds:>12,.0f} utterances/s  ({seconds:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.sessions, args.turns)
+    utterances = args.sessions * args.turns
+
+    full_nlp = spacy.load("en_core_web_sm")
+    start = time.perf_counter()
+    for messages, confidences in sessions:
+        legacy_calculate_score(full_nlp, messages, confidences)
+    report("before (full pipeline)", utterances, time.perf_counter() - start)
+
+    models.preload()  # load the tokenizer outside the measurement
+    start = time.perf_counter()
+    for messages, confidences in sessions:
+        calculate_score(messages, confidences)
+    report("after (inline)", utterances, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    score_sessions(sessions)
+    report("after (one batch)", utterances, time.perf_counter() - start)
+
+    async def close_all():
+        await asyncio.gather(*(scoring_engine.score(m, c) for m, c in sessions))
+
+    asyncio.run(close_all())  # start the workers outside the measurement
+    start = time.perf_counter()
+    asyncio.run(close_all())
+    report(
+        f"after (engine, {scoring_engine.workers} workers)",
+        utterances,
+        time.perf_counter() - start,
+    )
+    scoring_engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import gc
+import multiprocessing
+import os
+
+bind = f"{os.getenv('SERVER_HOST', '0.0.0.0')}:{os.getenv('SERVER_PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# import the app in the master, so the workers are forked with it already loaded
+preload_app = True
+
+
+def on_starting(server):
+    from src.conversation.utils.nlp import models
+
+    models.preload()
+    server.log.info(f"Preloaded NLP models: {models.stats()}")
+    # keep the loaded objects out of the workers' GC passes so their pages stay shared
+    gc.freeze()
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.billing.crud import stripe_service
 from src.billing.schemas import PlanRequest, PlanResponse, SubscriptionRequest
 from src.user.utils.deps import authenticated_user
-from utils.db.session import get_db
+from utils.db.session import get_async_db
 
 billing_router = APIRouter()
 
@@ -31,25 +33,38 @@ def checkout_session(request: SubscriptionRequest, authenticated: authenticated_
     return {"checkout_url": session.url, "session_id": session.id}
 
 
+async def _handle_webhook_event(db: AsyncSession, event):
+    # the Stripe API is called synchronously, keep it off the loop
+    if event["type"] == "checkout.session.completed":
+        session = event["data"]["object"]
+        subscription_id = session["subscription"]
+
+        subscription = await run_in_threadpool(
+            stripe_service.retrieve_subscription, subscription_id
+        )
+        payment_intent = await run_in_threadpool(
+            stripe_service.retrieve_payment_intent, session["invoice"]
+        )
+        await db.run_sync(stripe_service.add_subscription, subscription)
+        await db.run_sync(
+            stripe_service.add_payment, session, subscription_id, payment_intent
+        )
+
+    elif event["type"] == "invoice.payment_succeeded":
+        invoice = event["data"]["object"]
+
+        await db.run_sync(stripe_service.add_invoice, invoice)
+
+
 @billing_router.post("/webhook", status_code=status.HTTP_200_OK)
-async def stripe_webhook(request: Request, db: get_db):
+async def stripe_webhook(request: Request, db: get_async_db):
     payload = await request.body()
     sig_header = request.headers.get("Stripe-Signature")
     try:
         event = stripe_service.verify_webhook_signature(payload, sig_header)
         print(event)
 
-        if event["type"] == "checkout.session.completed":
-            session = event["data"]["object"]
-            subscription_id = session["subscription"]
-
-            stripe_service.add_subscription(db, subscription_id)
-            stripe_service.add_payment(db, session, subscription_id)
-
-        elif event["type"] == "invoice.payment_succeeded":
-            invoice = event["data"]["object"]
-
-            stripe_service.add_invoice(db, invoice)
+        await _handle_webhook_event(db, event)
 
         return {"message": "success"}
     except HTTPException as e:
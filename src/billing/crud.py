@@ -98,8 +98,17 @@ class StripeService:
             )
 
     @staticmethod
-    def add_subscription(db: Session, subscription_id: str):
-        subscription = stripe.Subscription.retrieve(subscription_id)
+    def retrieve_subscription(subscription_id: str):
+        return stripe.Subscription.retrieve(subscription_id)
+
+    @staticmethod
+    def retrieve_payment_intent(invoice_id: str):
+        invoice = stripe.Invoice.retrieve(invoice_id)
+        return stripe.PaymentIntent.retrieve(invoice["payment_intent"])
+
+    @staticmethod
+    def add_subscription(db: Session, subscription):
+        subscription_id = subscription.id
         price_id = subscription["items"]["data"][0]["price"]["id"]
         current_period_end = datetime.fromtimestamp(subscription.current_period_end)
 
@@ -167,11 +176,8 @@ class StripeService:
         return db_obj
 
     @staticmethod
-    def add_payment(db: Session, session: dict, subscription_id):
-        invoice_id = session["invoice"]
-        invoice = stripe.Invoice.retrieve(invoice_id)
-        payment_id = invoice["payment_intent"]
-        payment_intent = stripe.PaymentIntent.retrieve(payment_id)
+    def add_payment(db: Session, session: dict, subscription_id, payment_intent):
+        payment_id = payment_intent["id"]
         amount = payment_intent["amount_received"]
         currency = payment_intent["currency"]
         status = payment_intent["status"]
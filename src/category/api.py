@@ -1,15 +1,18 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from sqlalchemy.exc import NoResultFound
 
-from src.category.crud import category_crud, topic_crud
+from src.category.crud import category_crud, leaderboard_crud, topic_crud
 from src.category.schemas import (
     CategoryRequest,
     CategoryResponse,
+    LeaderboardResponse,
     TopicRequest,
     TopicResponse,
 )
+from src.category.utils.leaderboard import leaderboard_cache
+from src.config import Config
 from src.user.models import UserRoles
 from src.user.utils.deps import authenticated_user, is_authorized, is_authorized_for
 from utils.db.session import get_db
@@ -31,12 +34,26 @@ def add_category(
 @category_router.get(
     "/category", response_model=List[CategoryResponse], status_code=status.HTTP_200_OK
 )
-def get_category(db: get_db, authenticated: is_authorized):
+def get_category(
+    db: get_db,
+    authenticated: is_authorized,
+    response: Response,
+    # the page size get_multi served before the cursors
+    limit: int = Query(10, ge=1, le=Config.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
     if not authenticated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
-    categories = category_crud.get_multi(db=db)
+
+    try:
+        categories, next_cursor = category_crud.get_page(db, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return categories
 
 
@@ -54,17 +71,27 @@ def add_topic(
 @category_router.get(
     "/topic", response_model=List[TopicResponse], status_code=status.HTTP_200_OK
 )
-def get_topic(authenticated: authenticated_user, category_name: Optional[str] = None):
+def get_topic(
+    authenticated: authenticated_user,
+    response: Response,
+    category_name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=Config.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    """Every topic, unless `limit` or `after` asks for a page. The `X-Next-Cursor`
+    header then holds the `after` value of the next page."""
     user, db = authenticated
 
+    if limit is None and after is not None:
+        limit = Config.PAGE_SIZE
+
     try:
-        topics = topic_crud.get_by_category(db, category_name)
+        topics, next_cursor = topic_crud.get_with_scores(
+            db, user.id, category_name, limit, after
+        )
 
         topic_responses = []
-        for topic in topics:
-            high_score = topic_crud.get_high_score(db, topic.name)
-            your_score = topic_crud.get_user_score(db, user.id, topic.id)
-
+        for topic, high_score, your_score in topics:
             topic_responses.append(
                 TopicResponse(
                     id=topic.id,
@@ -78,7 +105,41 @@ def get_topic(authenticated: authenticated_user, category_name: Optional[str] =
                 )
             )
 
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return topic_responses
 
     except NoResultFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@category_router.get(
+    "/topic/{topic_id}/leaderboard",
+    response_model=List[LeaderboardResponse],
+    status_code=status.HTTP_200_OK,
+)
+def get_leaderboard(topic_id: str, db: get_db, authenticated: is_authorized):
+    if not authenticated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+        )
+
+    ranking = leaderboard_cache.get(topic_id)
+    if ranking is None:
+        if not topic_crud.get(db, topic_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found"
+            )
+        ranking = leaderboard_cache.put(
+            topic_id, leaderboard_crud.top(db, topic_id, leaderboard_cache.size)
+        )
+
+    return [
+        LeaderboardResponse(
+            rank=rank, user_id=entry.user_id, name=entry.name, score=entry.score
+        )
+        for rank, entry in enumerate(ranking, start=1)
+    ]
@@ -1,19 +1,31 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Select, String, cast, delete, exists, literal, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
+from sqlalchemy.sql import case, func
 
-from src.category.models import Category, Topic
+from src.category.models import Category, Topic, TopicLeaderboard
 from src.category.schemas import (
     CategoryRequest,
     CategoryResponse,
     TopicRequest,
     TopicResponse,
 )
-from src.conversation.models import Report
-from utils.crud.base import CRUDBase
+from src.category.utils.leaderboard import (
+    LeaderboardEntry,
+    display_name,
+    leaderboard_cache,
+)
+from src.conversation.models import Conversation, Report
+from src.conversation.utils.tts import topic_intro, tts
+from src.user.models import User
+from utils.crud.async_base import AsyncCRUDBase
+from utils.crud.base import CRUDBase, keyset_page, keyset_query
 
 
 class CategoryCRUD(CRUDBase[Category, CategoryRequest, CategoryResponse]):
@@ -49,40 +61,164 @@ class TopicCRUD(CRUDBase[Topic, TopicRequest, TopicResponse]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+
+        # every session on this topic opens with the intro, have its audio ready
+        tts.prefetch(topic_intro(db_obj.name))
         return db_obj
 
-    def get_by_category(
-        self, db: Session, category_name: Optional[str] = None
-    ) -> List[Topic]:
-        if category_name:
-            category = db.query(Category).filter(Category.name == category_name).first()
-            if not category:
-                raise NoResultFound(f"Category '{category_name}' not found")
-            return db.query(Topic).filter(Topic.category_id == category.id).all()
-
-        return db.query(Topic).all()
-
-    def get_high_score(self, db: Session, topic_name: str) -> Optional[float]:
-        topic = db.query(Topic).filter(Topic.name == topic_name).first()
-        if not topic:
-            raise NoResultFound(f"Topic '{topic_name}' not found")
-
-        high_score = (
-            db.query(func.max(Report.score))
-            .filter(Report.topic_id == topic.id)
-            .scalar()
-        )
-        return high_score
-
-    def get_user_score(
-        self, db: Session, user_id: str, topic_id: str
-    ) -> Optional[float]:
-        user_score = (
-            db.query(func.max(Report.score))
-            .filter(Report.topic_id == topic_id, Report.user_id == user_id)
-            .scalar()
+    def get_with_scores(
+        self,
+        db: Session,
+        user_id: str,
+        category_name: Optional[str] = None,
+        limit: Optional[int] = 10,
+        after: Optional[str] = None,
+    ) -> Tuple[List[Tuple[Topic, Optional[float], Optional[float]]], Optional[str]]:
+        """A page of topics with their high score and the user's best score, in one
+        query, and the cursor of the next page. Without a `limit` every topic is
+        returned.
+        """
+        query = (
+            select(
+                Topic,
+                func.max(Report.score).label("high_score"),
+                func.max(case((Report.user_id == user_id, Report.score))).label(
+                    "your_score"
+                ),
+            )
+            .outerjoin(Report, Report.topic_id == Topic.id)
+            .group_by(Topic.id)
         )
-        return user_score
+        keys = self.page_keys(["created_at", "id"])
+        query = self._by_category(db, query, category_name)
+        if limit is None:
+            return db.execute(query.order_by(*keys)).all(), None
+
+        query = keyset_query(query, keys, limit, after)
+        return keyset_page(db.execute(query).all(), keys, limit)
+
+    @staticmethod
+    def _by_category(
+        db: Session, query: Select, category_name: Optional[str]
+    ) -> Select:
+        if not category_name:
+            return query
+
+        category = db.query(Category).filter(Category.name == category_name).first()
+        if not category:
+            raise NoResultFound(f"Category '{category_name}' not found")
+        return query.filter(Topic.category_id == category.id)
 
 
 topic_crud = TopicCRUD(Topic)
+async_topic_crud = AsyncCRUDBase[Topic, TopicRequest, TopicResponse](Topic)
+
+
+class LeaderboardCRUD:
+    @staticmethod
+    async def record(
+        db: AsyncSession, topic_id: str, user_id: str, score: float, created_by: str
+    ):
+        """Keeps the user's best score on the topic, without committing. Callers
+        skip sessions where the user never spoke."""
+        stmt = insert(TopicLeaderboard).values(
+            topic_id=topic_id,
+            user_id=user_id,
+            best_score=score,
+            created_by=created_by,
+            updated_by=created_by,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TopicLeaderboard.topic_id, TopicLeaderboard.user_id],
+                set_={
+                    "best_score": func.greatest(
+                        TopicLeaderboard.best_score, stmt.excluded.best_score
+                    ),
+                    "updated_at": datetime.now(),
+                    "updated_by": created_by,
+                },
+            )
+        )
+
+    @staticmethod
+    def top(db: Session, topic_id: str, limit: int) -> List[LeaderboardEntry]:
+        rows = (
+            db.query(
+                TopicLeaderboard.best_score,
+                TopicLeaderboard.user_id,
+                User.firstname,
+                User.lastname,
+            )
+            .join(User, User.id == TopicLeaderboard.user_id)
+            .filter(TopicLeaderboard.topic_id == topic_id)
+            .order_by(
+                TopicLeaderboard.best_score.desc(), TopicLeaderboard.user_id.desc()
+            )
+            .limit(limit)
+            .all()
+        )
+        return [
+            LeaderboardEntry(score, user_id, display_name(firstname, lastname))
+            for score, user_id, firstname, lastname in rows
+        ]
+
+    @staticmethod
+    def rebuild(db: Session, created_by: str = "system"):
+        """Recomputes every best score from the reports, e.g. after a rescore.
+
+        Sessions where the user never spoke do not count, as in `record`, and
+        entries left without a scored report are removed. Only this process's
+        cached boards are dropped, other workers reload theirs once they expire.
+        """
+        scored = (
+            Report.topic_id.is_not(None),
+            Report.user_id.is_not(None),
+            Report.score.is_not(None),
+            exists().where(
+                Conversation.session_id == Report.session_id,
+                Conversation.role == "user",
+            ),
+        )
+        db.execute(
+            delete(TopicLeaderboard).where(
+                ~exists().where(
+                    Report.topic_id == TopicLeaderboard.topic_id,
+                    Report.user_id == TopicLeaderboard.user_id,
+                    *scored,
+                )
+            )
+        )
+
+        best = (
+            select(
+                cast(func.gen_random_uuid(), String),
+                Report.topic_id,
+                Report.user_id,
+                func.max(Report.score),
+                literal(created_by),
+                literal(created_by),
+            )
+            .where(*scored)
+            .group_by(Report.topic_id, Report.user_id)
+        )
+        stmt = insert(TopicLeaderboard).from_select(
+            ["id", "topic_id", "user_id", "best_score", "created_by", "updated_by"],
+            best,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TopicLeaderboard.topic_id, TopicLeaderboard.user_id],
+                set_={
+                    "best_score": stmt.excluded.best_score,
+                    "updated_at": datetime.now(),
+                    "updated_by": created_by,
+                },
+            )
+        )
+        db.commit()
+        # every topic may have changed
+        leaderboard_cache.invalidate()
+
+
+leaderboard_crud = LeaderboardCRUD()
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql.sqltypes import String
+from sqlalchemy.sql.sqltypes import Float, String
 
 from utils.db.base import ModelBase
 
@@ -25,3 +25,19 @@ class Category(ModelBase):
     description = Column(String, nullable=True)
 
     topic = relationship("Topic", back_populates="category", cascade="all, delete")
+
+
+class TopicLeaderboard(ModelBase):
+    """Every user's best score on a topic, kept up to date as reports are written."""
+
+    best_score = Column(Float, nullable=False)
+
+    topic_id = Column(
+        String, ForeignKey("topic.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("topic_id", "user_id"),
+        Index("ix_topic_leaderboard_topic_id_best_score", "topic_id", "best_score"),
+    )
@@ -26,3 +26,10 @@ class TopicResponse(BaseSchema):
     category_id: str
     high_score: Optional[float] = 0
     your_score: Optional[float] = 0
+
+
+class LeaderboardResponse(BaseModel):
+    rank: int
+    user_id: str
+    name: Optional[str]
+    score: float
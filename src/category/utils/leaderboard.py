@@ -0,0 +1,99 @@
+import heapq
+import threading
+from typing import List, NamedTuple, Optional
+
+from cachetools import TTLCache
+
+from src.config import Config
+
+
+class LeaderboardEntry(NamedTuple):
+    score: float
+    user_id: str
+    name: Optional[str]
+
+
+def display_name(firstname: Optional[str], lastname: Optional[str]) -> Optional[str]:
+    return " ".join(filter(None, (firstname, lastname))) or None
+
+
+class TopicBoard:
+    """The top `size` entries of one topic, kept as a min-heap on the score."""
+
+    def __init__(self, size: int, entries: List[LeaderboardEntry]):
+        self.size = size
+        self._heap = heapq.nlargest(size, entries)
+        heapq.heapify(self._heap)
+        self._ranking: Optional[List[LeaderboardEntry]] = None
+
+    def ranking(self) -> List[LeaderboardEntry]:
+        if self._ranking is None:
+            self._ranking = sorted(self._heap, reverse=True)
+        return self._ranking
+
+    def record(self, entry: LeaderboardEntry):
+        current = next((e for e in self._heap if e.user_id == entry.user_id), None)
+        if current:
+            if entry.score <= current.score:
+                return
+            self._heap.remove(current)
+            heapq.heapify(self._heap)
+
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return
+        self._ranking = None
+
+
+class LeaderboardCache:
+    """Per-worker cache of the top entries of each topic's leaderboard.
+
+    A board is loaded from `topic_leaderboard` on a miss and kept for `ttl`
+    seconds. Scores written by this worker are merged into its cached board
+    right away and `LeaderboardCRUD.rebuild` drops every board; writes from
+    other workers or processes, such as the rescore job, show up once the
+    board expires.
+    """
+
+    def __init__(
+        self,
+        size: int = Config.LEADERBOARD_SIZE,
+        ttl: float = Config.LEADERBOARD_TTL_SECONDS,
+        max_topics: int = 1024,
+    ):
+        self.size = size
+        self._boards = TTLCache(maxsize=max_topics, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, topic_id: str) -> Optional[List[LeaderboardEntry]]:
+        with self._lock:
+            board = self._boards.get(topic_id)
+            return board.ranking() if board else None
+
+    def put(
+        self, topic_id: str, entries: List[LeaderboardEntry]
+    ) -> List[LeaderboardEntry]:
+        board = TopicBoard(self.size, entries)
+        with self._lock:
+            self._boards[topic_id] = board
+        return board.ranking()
+
+    def record(self, topic_id: str, entry: LeaderboardEntry):
+        """Merges a new score into the topic's board, if it is cached."""
+        with self._lock:
+            board = self._boards.get(topic_id)
+            if board:
+                board.record(entry)
+
+    def invalidate(self, topic_id: Optional[str] = None):
+        with self._lock:
+            if topic_id:
+                self._boards.pop(topic_id, None)
+            else:
+                self._boards.clear()
+
+
+leaderboard_cache = LeaderboardCache()
@@ -33,6 +33,18 @@ class Config:
     else:
         BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
+    # Outgoing HTTP client pool (shared per worker)
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+
+    # Rows per statement of the bulk writes in utils/crud/base.py
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", 5000))
+
     @staticmethod
     def assemble_db_connection():
         return PostgresDsn.build(
@@ -44,6 +56,17 @@ class Config:
             path=os.environ["POSTGRES_DB"] or "",
         ).unicode_string()
 
+    @staticmethod
+    def assemble_async_db_connection():
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=os.environ["POSTGRES_USER"],
+            password=os.environ["POSTGRES_PASSWORD"],
+            port=int(os.environ["POSTGRES_PORT"]),
+            host=os.environ["POSTGRES_SERVER"],
+            path=os.environ["POSTGRES_DB"] or "",
+        ).unicode_string()
+
     ##############################################################################################
     #       ModelBase config is done. if you are adding new domain to this project please make
     # separate config division like made for user below this. if you have different integration
@@ -55,6 +78,11 @@ class Config:
     JWT_SECRET_KEY: str = os.environ["JWT_SECRET_KEY"]
     JWT_EXPIRATION_TIME: int = os.environ["JWT_EXPIRATION_TIME"]
 
+    # Verified tokens and authenticated users, cached per worker
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", 10000))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", 10000))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+
     # Google SSO
     GOOGLE_CLIENT_ID: str = os.environ["GOOGLE_CLIENT_ID"]
     GOOGLE_PROJECT_ID: str = os.environ["GOOGLE_PROJECT_ID"]
@@ -82,6 +110,47 @@ class Config:
     STRIPE_CANCEL_URL: str = os.environ["STRIPE_CANCEL_URL"]
     STRIPE_WEBHOOK_SECRET: str = os.environ["STRIPE_WEBHOOK_SECRET"]
 
+    # List endpoints, keyset paginated
+    PAGE_SIZE: int = int(os.getenv("PAGE_SIZE", 20))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", 100))
+
+    # Topic leaderboards, cached per worker
+    LEADERBOARD_SIZE: int = int(os.getenv("LEADERBOARD_SIZE", 10))
+    LEADERBOARD_TTL_SECONDS: float = float(os.getenv("LEADERBOARD_TTL_SECONDS", 30))
+
     # Conversation Config
     GROQ_KEY: str = os.environ["GROQ_KEY"]
     TOGETHER_AI_API_KEY: str = os.environ["TOGETHER_AI_API_KEY"]
+
+    # Client audio ingest (16-bit little-endian mono PCM over the WebSocket)
+    AUDIO_SAMPLE_RATE: int = int(os.getenv("AUDIO_SAMPLE_RATE", 16000))
+    AUDIO_SILENCE_RMS: int = int(os.getenv("AUDIO_SILENCE_RMS", 500))
+    UTTERANCE_SILENCE_MS: int = int(os.getenv("UTTERANCE_SILENCE_MS", 800))
+    UTTERANCE_MIN_VOICED_MS: int = int(os.getenv("UTTERANCE_MIN_VOICED_MS", 200))
+    UTTERANCE_MAX_SECONDS: int = int(os.getenv("UTTERANCE_MAX_SECONDS", 30))
+    # start transcription and the reply speculatively after a shorter pause (0 disables)
+    UTTERANCE_SPECULATE_MS: int = int(os.getenv("UTTERANCE_SPECULATE_MS", 300))
+
+    # Conversation turns are written behind in batches
+    CONVERSATION_FLUSH_ROWS: int = int(os.getenv("CONVERSATION_FLUSH_ROWS", 20))
+    CONVERSATION_FLUSH_SECONDS: float = float(
+        os.getenv("CONVERSATION_FLUSH_SECONDS", 10)
+    )
+
+    # NLP model, loaded from local files only (a spaCy package name or model directory)
+    SPACY_MODEL: str = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    NLP_PRELOAD: bool = os.getenv("NLP_PRELOAD", "false").lower() == "true"
+
+    # Session scoring worker pool
+    SCORING_WORKERS: int = int(os.getenv("SCORING_WORKERS", 1))
+    SCORING_BATCH_SIZE: int = int(os.getenv("SCORING_BATCH_SIZE", 64))
+
+    # Text to speech worker pool
+    TTS_WORKERS: int = int(os.getenv("TTS_WORKERS", 2))
+    TTS_VOICE: Optional[str] = os.getenv("TTS_VOICE")
+    TTS_RATE: int = int(os.getenv("TTS_RATE", 200))
+    TTS_CACHE_DIR: str = os.getenv(
+        "TTS_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "tts")
+    )
+    TTS_CACHE_MEMORY_MB: int = int(os.getenv("TTS_CACHE_MEMORY_MB", 64))
+    TTS_CACHE_DISK_MB: int = int(os.getenv("TTS_CACHE_DISK_MB", 1024))
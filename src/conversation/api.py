@@ -1,11 +1,20 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, WebSocket, status
+from fastapi import APIRouter, HTTPException, Query, Response, WebSocket, status
 
+from src.config import Config
 from src.conversation.crud import conversation_crud, history_crud
-from src.conversation.schemas import HistoryResponse
+from src.conversation.schemas import HistoryResponse, StreamMode
 from src.conversation.utils.communication import websocket_conversation
-from src.user.utils.deps import authenticated_user
+from src.conversation.utils.nlp import models
+from src.user.models import UserRoles
+from src.user.utils.deps import (
+    authenticated_user,
+    detached_authenticated_user,
+    is_authorized_for,
+)
+from utils.db.session import async_session_scope
+from utils.http.client import http_pool
 
 conversation_router = APIRouter()
 
@@ -13,32 +22,60 @@ conversation_router = APIRouter()
 @conversation_router.websocket("/conversation")
 async def conversation(
     websocket: WebSocket,
-    authenticated: authenticated_user,
+    user: detached_authenticated_user,
     topic_id: str,
     duration: int,
+    # the ingest frames are sized from it, an invalid rate closes the socket (1008)
+    sample_rate: int = Query(Config.AUDIO_SAMPLE_RATE, ge=8000, le=48000),
+    stream: Optional[StreamMode] = None,
+    live_score: bool = False,
 ):
-    user, db = authenticated
-
-    if conversation_crud.check_conversation_permission(db, user.id) == 0:
+    async with async_session_scope() as db:
+        remaining = await db.run_sync(
+            conversation_crud.check_conversation_permission, user.id
+        )
+    if remaining == 0:
         return {"message": "You have reached the maximum number of conversations."}
 
-    await websocket_conversation(websocket, db, user, topic_id, duration)
+    await websocket_conversation(
+        websocket,
+        user,
+        topic_id,
+        duration,
+        sample_rate=sample_rate,
+        stream=stream,
+        live_score=live_score,
+    )
 
 
 @conversation_router.get(
     "/history", response_model=List[HistoryResponse], status_code=status.HTTP_200_OK
 )
-def get_history(authenticated: authenticated_user):
+def get_history(
+    authenticated: authenticated_user,
+    response: Response,
+    limit: int = Query(Config.PAGE_SIZE, ge=1, le=Config.MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+):
+    """Returns the user's sessions, newest first. When there are more, the
+    `X-Next-Cursor` header holds the `after` value of the next page."""
     user, db = authenticated
 
     try:
-        return history_crud.get_user_history(db, user.id)
+        history, next_cursor = history_crud.get_user_history(db, user.id, limit, after)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
 
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return history
+
 
 @conversation_router.post("/start-conversation", status_code=status.HTTP_200_OK)
 def start_conversation(authenticated: authenticated_user):
@@ -50,3 +87,13 @@ def start_conversation(authenticated: authenticated_user):
         "message": permission["message"],
         "remaining conversations": permission["remaining_conversations"],
     }
+
+
+@conversation_router.get("/http-pool", status_code=status.HTTP_200_OK)
+def get_http_pool_stats(_: is_authorized_for([UserRoles.ADMIN.value])):
+    return http_pool.stats()
+
+
+@conversation_router.get("/models", status_code=status.HTTP_200_OK)
+def get_model_stats(_: is_authorized_for([UserRoles.ADMIN.value])):
+    return models.stats()
@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy import Select, case, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.billing.models import Plan, Subscription
@@ -8,13 +10,14 @@ from src.category.models import Topic
 from src.conversation.models import Conversation, ConversationSession, Report
 from src.conversation.schemas import HistoryResponse
 from src.user.models import User
-from utils.crud.base import CRUDBase
+from src.user.utils.cache import user_cache
+from utils.crud.base import CRUDBase, keyset_page, keyset_query
 
 
 class ConversationSessionCRUD:
     @staticmethod
-    def create(
-        db: Session, user_id: str, created_by: str, topic_id: str
+    async def create(
+        db: AsyncSession, user_id: str, created_by: str, topic_id: str
     ) -> ConversationSession:
         session = ConversationSession(
             user_id=user_id,
@@ -23,107 +26,181 @@ class ConversationSessionCRUD:
             topic_id=topic_id,
         )
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        await db.commit()
         return session
 
+    @staticmethod
+    async def set_total_time(db: AsyncSession, session_id: str, total_time: float):
+        await db.execute(
+            update(ConversationSession)
+            .where(ConversationSession.id == session_id)
+            .values(total_time=total_time)
+        )
+
 
 conversation_session_crud = ConversationSessionCRUD()
 
 
 class ConversationCrud:
     @staticmethod
-    def user_conversation(
-        db: Session, session_id: str, content: str, created_by: str
-    ) -> Conversation:
-        conversation = Conversation(
-            role="user",
-            content=content,
-            session_id=session_id,
-            created_by=created_by,
-            updated_by=created_by,
+    async def add_many(db: AsyncSession, rows: List[dict]):
+        """Inserts conversation rows in one multi-row INSERT, without committing."""
+        await db.execute(insert(Conversation), rows)
+
+    @staticmethod
+    def check_conversation_permission(db: Session, user_id: str) -> Optional[int]:
+        """Uses up one conversation of the user's plan and returns how many are left.
+
+        The limit check and the increment are one conditional UPDATE, so
+        concurrent starts cannot overrun the plan. A new subscription period
+        (a different `current_period_end`) starts the count over.
+        """
+        users = User.__table__
+        latest_subscription = ConversationCrud._latest_subscription(
+            Subscription.id, user_id
+        ).scalar_subquery()
+        new_period = users.c.quota_period_end.is_distinct_from(
+            Subscription.current_period_end
         )
-        db.add(conversation)
+        # a new period starts the count over
+        used = case((new_period, 0), else_=func.coalesce(users.c.used_conversations, 0))
+        consumed = db.execute(
+            update(users)
+            .where(
+                users.c.id == user_id,
+                Subscription.id == latest_subscription,
+                Plan.id == Subscription.plan_id,
+                or_(
+                    Plan.allowed_conversations.is_(None),
+                    used < Plan.allowed_conversations,
+                ),
+            )
+            .values(
+                used_conversations=used + 1,
+                quota_period_end=Subscription.current_period_end,
+            )
+            .returning(Plan.allowed_conversations - users.c.used_conversations)
+        ).first()
+        if consumed is None:
+            db.rollback()
+            ConversationCrud._raise_quota_error(db, user_id)
         db.commit()
-        db.refresh(conversation)
-        return conversation
+        # a Core UPDATE skips the flush events the user cache listens to
+        user_cache.invalidate(user_id)
+        return consumed[0]
 
     @staticmethod
-    def ai_conversation(
-        db: Session, session_id: str, content: str, created_by: str
-    ) -> Conversation:
-        conversation = Conversation(
-            role="ai",
-            content=content,
-            session_id=session_id,
-            created_by=created_by,
-            updated_by=created_by,
+    def _latest_subscription(entity, user_id: str) -> Select:
+        return (
+            select(entity)
+            .where(Subscription.user_id == user_id)
+            .order_by(Subscription.current_period_end.desc().nulls_last())
+            .limit(1)
         )
-        db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
-        return conversation
 
     @staticmethod
-    def check_conversation_permission(db: Session, user_id: str):
-        subscription = (
-            db.query(Subscription).filter(Subscription.user_id == user_id).first()
+    def _raise_quota_error(db: Session, user_id: str):
+        """Tells why no conversation could be used up."""
+        if not db.get(User, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+
+        subscription = db.scalar(
+            ConversationCrud._latest_subscription(Subscription, user_id)
         )
         if not subscription:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User does not have subscription",
             )
-
-        plan = db.query(Plan).filter(Plan.id == subscription.plan_id).first()
-        if not plan:
+        if not db.get(Plan, subscription.plan_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Plan with the subscription not found",
             )
 
-        allowed_conversations = plan.allowed_conversations
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You exceeded allowed conversations for the subscription plan",
+        )
 
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-            )
 
-        if user.used_conversations >= allowed_conversations:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You exceeded allowed conversations for the subscription plan",
-            )
+conversation_crud = ConversationCrud()
 
-        user.used_conversations += 1
-        db.commit()
-        db.refresh(user)
 
-        return allowed_conversations - user.used_conversations
+class ReportCRUD:
+    @staticmethod
+    async def upsert(
+        db: AsyncSession,
+        user_id: str,
+        topic_id: str,
+        session_id: str,
+        score: float,
+        words_spoken: int,
+        created_by: str,
+        pronunciation: Optional[float] = None,
+    ) -> Report:
+        """Creates or updates the session's report, without committing."""
+        report = await db.scalar(select(Report).where(Report.session_id == session_id))
+        if report:
+            report.score = score
+            report.words_spoken = words_spoken
+            report.pronunciation = pronunciation
+        else:
+            report = Report(
+                user_id=user_id,
+                topic_id=topic_id,
+                session_id=session_id,
+                score=score,
+                words_spoken=words_spoken,
+                pronunciation=pronunciation,
+                created_by=created_by,
+                updated_by=created_by,
+            )
+            db.add(report)
+        return report
 
 
-conversation_crud = ConversationCrud()
+report_crud = ReportCRUD()
 
 
 class HistoryCRUD(CRUDBase[ConversationSession, None, HistoryResponse]):
-    def get_user_history(self, db: Session, user_id: str) -> List[HistoryResponse]:
-        sessions = (
-            db.query(ConversationSession)
+    def get_user_history(
+        self, db: Session, user_id: str, limit: int, after: Optional[str] = None
+    ) -> Tuple[List[HistoryResponse], Optional[str]]:
+        """Returns a page of the user's sessions, newest first, and the next cursor.
+
+        Pages are keyed on `(created_at, id)`, so every page is an index range scan
+        no matter how deep it is.
+        """
+        score = (
+            select(Report.score)
+            .where(Report.session_id == ConversationSession.id)
+            .limit(1)
+            .scalar_subquery()
+            .label("score")
+        )
+        query = (
+            select(
+                ConversationSession.id,
+                ConversationSession.created_at,
+                ConversationSession.total_time,
+                Topic.name,
+                score,
+            )
             .join(Topic, Topic.id == ConversationSession.topic_id)
-            .outerjoin(Report, Report.session_id == ConversationSession.id)
-            .filter(ConversationSession.user_id == user_id)
-            .all()
+            .where(ConversationSession.user_id == user_id)
         )
+        keys = self.page_keys(["created_at", "id"])
+        query = keyset_query(query, keys, limit, after, descending=True)
+        rows, next_cursor = keyset_page(db.execute(query).all(), keys, limit)
         return [
             HistoryResponse(
-                id=session.id,
-                topic=session.topic.name,
-                mins=session.total_time,
-                score=session.report[0].score if session.report else None,
+                id=row.id, topic=row.name, mins=row.total_time, score=row.score
             )
-            for session in sessions
-        ]
+            for row in rows
+        ], next_cursor
 
 
 history_crud = HistoryCRUD(ConversationSession)
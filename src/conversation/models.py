@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import Float, Integer, String
 
@@ -19,6 +19,15 @@ class ConversationSession(ModelBase):
         "Conversation", back_populates="session", cascade="all, delete"
     )
 
+    __table_args__ = (
+        Index(
+            "ix_conversation_session_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+    )
+
 
 class Conversation(ModelBase):
     role = Column(String, nullable=False)
@@ -30,11 +39,17 @@ class Conversation(ModelBase):
 
     session = relationship("ConversationSession", back_populates="conversation")
 
+    __table_args__ = (
+        Index("ix_conversation_session_id_created_at", "session_id", "created_at"),
+    )
+
 
 class Report(ModelBase):
     score = Column(Float, default=0)
     feedback = Column(String, nullable=True)
     words_spoken = Column(Integer, default=0)
+    # average pronunciation sub-score, scored from the audio that is not stored
+    pronunciation = Column(Float, nullable=True)
 
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"))
     topic_id = Column(String, ForeignKey("topic.id"))
@@ -44,3 +59,5 @@ class Report(ModelBase):
 
     topic = relationship(Topic, back_populates="report")
     session = relationship("ConversationSession", back_populates="report")
+
+    __table_args__ = (Index("ix_report_session_id", "session_id"),)
@@ -0,0 +1,161 @@
+"""Recomputes `Report.score` and `Report.words_spoken` for past sessions.
+
+    python -m src.conversation.rescore [--workers N] [--restart]
+
+User turns are streamed from a server-side cursor in `session_id` order and
+scored in a pool of worker processes. The turns' audio is not stored, so the
+pronunciation sub-score the session got live (`Report.pronunciation`) is kept;
+sessions scored before it was stored fall back to the STT confidence rubric,
+which is what they were scored with then. Each batch of scores is written with one
+executemany UPDATE, then the last rescored `session_id` is checkpointed, so an
+interrupted run picks up where it left off.
+
+The API workers' cached leaderboards are not reachable from here; they show the
+rebuilt boards once they expire (`LEADERBOARD_TTL_SECONDS`).
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import false
+
+from src.category.crud import leaderboard_crud
+from src.config import Config
+from src.conversation.models import Conversation, Report
+from src.conversation.utils.nlp import models
+from src.conversation.utils.score import score_sessions
+from src.user.crud import user_stats_crud
+from utils.db.session import SessionLocal
+from utils.io import read_json_file, write_json_file
+
+CHECKPOINT_PATH = os.path.join(Config.BASE_DIR, ".cache", "rescore.json")
+
+SessionTurns = Tuple[str, List[str], Optional[float]]
+
+
+def stream_sessions(
+    db: Session, after: Optional[str], yield_per: int
+) -> Iterator[SessionTurns]:
+    """Yields `(session_id, user_messages, pronunciation)` in `session_id` order."""
+    query = (
+        select(Conversation.session_id, Conversation.content, Report.pronunciation)
+        .outerjoin(Report, Report.session_id == Conversation.session_id)
+        .where(Conversation.role == "user", Conversation.is_deleted == false())
+        .order_by(Conversation.session_id, Conversation.created_at)
+        .execution_options(yield_per=yield_per)
+    )
+    if after:
+        query = query.where(Conversation.session_id > after)
+
+    rows = db.execute(query)
+    for session_id, turns in groupby(rows, key=itemgetter(0)):
+        turns = list(turns)
+        yield session_id, [content or "" for _, content, _ in turns], turns[0][2]
+
+
+def batched(sessions: Iterator[SessionTurns], size: int) -> Iterator[list]:
+    batch = []
+    for session in sessions:
+        batch.append(session)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rescore_batch(batch: List[SessionTurns]) -> List[dict]:
+    """Runs in a worker process. Stored turns carry no STT confidence."""
+    scores = score_sessions(
+        [(messages, [0] * len(messages)) for _, messages, _ in batch],
+        pronunciation=[pronunciation for _, _, pronunciation in batch],
+    )
+    return [
+        {"b_session_id": session_id, "b_score": score, "b_words": words}
+        for (session_id, _, _), (score, words) in zip(batch, scores)
+    ]
+
+
+update_report = (
+    update(Report.__table__)
+    .where(Report.__table__.c.session_id == bindparam("b_session_id"))
+    .values(score=bindparam("b_score"), words_spoken=bindparam("b_words"))
+)
+
+
+def rescore(
+    workers: int,
+    batch_size: int,
+    yield_per: int,
+    checkpoint_path: str = CHECKPOINT_PATH,
+    restart: bool = False,
+):
+    checkpoint = {}
+    if not restart and os.path.exists(checkpoint_path):
+        checkpoint = read_json_file(checkpoint_path) or {}
+    after = checkpoint.get("last_session_id")
+    done = checkpoint.get("sessions", 0)
+    if after:
+        print(f"Resuming after session {after} ({done} sessions already rescored)")
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+
+    # load the models once here, the forked workers share them
+    models.preload()
+
+    start = time.perf_counter()
+    rescored = 0
+
+    def write(db: Session, rows: List[dict]):
+        nonlocal rescored
+        db.connection().execute(update_report, rows)
+        db.commit()
+        rescored += len(rows)
+        write_json_file(
+            checkpoint_path,
+            {"last_session_id": rows[-1]["b_session_id"], "sessions": done + rescored},
+        )
+        rate = rescored / (time.perf_counter() - start)
+        print(f"{done + rescored} sessions rescored, {rate:,.0f} sessions/s")
+
+    with SessionLocal() as reader, SessionLocal() as writer, ProcessPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        batches = batched(stream_sessions(reader, after, yield_per), batch_size)
+        # keep a couple of batches per worker in flight, results come back in order
+        pending = []
+        for batch in batches:
+            pending.append(executor.submit(rescore_batch, batch))
+            if len(pending) >= workers * 2:
+                write(writer, pending.pop(0).result())
+        for future in pending:
+            write(writer, future.result())
+
+        # the best scores and the users' totals may have changed in either direction
+        leaderboard_crud.rebuild(writer)
+        user_stats_crud.backfill(writer)
+
+    print(f"Rescored {rescored} sessions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore past conversation sessions.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=500, help="sessions per task")
+    parser.add_argument("--yield-per", type=int, default=5000, help="rows per fetch")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint")
+    args = parser.parse_args()
+
+    rescore(
+        args.workers, args.batch_size, args.yield_per, args.checkpoint, args.restart
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel
@@ -8,3 +9,8 @@ class HistoryResponse(BaseModel):
     topic: str
     mins: float
     score: Optional[float] = None
+
+
+class StreamMode(str, Enum):
+    TOKENS = "tokens"
+    SENTENCES = "sentences"
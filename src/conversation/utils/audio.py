@@ -0,0 +1,195 @@
+import io
+import wave
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from src.config import Config
+
+FRAME_MS = 20
+PRE_ROLL_MS = 300
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wraps raw 16-bit mono PCM into an in-memory WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def is_wav(chunk: bytes) -> bool:
+    return chunk[:4] == b"RIFF" and chunk[8:12] == b"WAVE"
+
+
+def frame_rms(samples: np.ndarray, frame_samples: int) -> np.ndarray:
+    """RMS energy of every whole frame of `frame_samples` samples."""
+    usable = len(samples) - len(samples) % frame_samples
+    frames = samples[:usable].reshape(-1, frame_samples).astype(np.float32)
+    return np.sqrt(np.mean(frames**2, axis=1))
+
+
+@dataclass
+class AcousticMetrics:
+    duration: float  # seconds
+    voiced_seconds: float
+    pause_ratio: float  # share of silence between the first and the last voiced frame
+    energy_variation: float  # coefficient of variation of the voiced frames' RMS
+
+
+def acoustic_metrics(
+    wav: bytes, silence_rms: int = Config.AUDIO_SILENCE_RMS
+) -> Optional[AcousticMetrics]:
+    """Fluency metrics of a 16-bit WAV utterance, or None if it can't be read."""
+    try:
+        with wave.open(io.BytesIO(wav), "rb") as reader:
+            if reader.getsampwidth() != SAMPLE_WIDTH:
+                return None
+            channels = reader.getnchannels()
+            sample_rate = reader.getframerate()
+            pcm = reader.readframes(reader.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    samples = np.frombuffer(pcm, dtype="<i2")[::channels]  # first channel only
+    rms = frame_rms(samples, sample_rate * FRAME_MS // 1000)
+    voiced = rms >= silence_rms
+    duration = len(samples) / sample_rate
+    if not voiced.any():
+        return AcousticMetrics(duration, 0.0, 1.0, 0.0)
+
+    first, last = np.flatnonzero(voiced)[[0, -1]]
+    voiced_frames = int(voiced.sum())
+    voiced_rms = rms[voiced]
+    return AcousticMetrics(
+        duration=duration,
+        voiced_seconds=voiced_frames * FRAME_MS / 1000,
+        pause_ratio=float(1 - voiced_frames / (last - first + 1)),
+        energy_variation=float(voiced_rms.std() / voiced_rms.mean()),
+    )
+
+
+@dataclass
+class Utterance:
+    audio: bytes  # WAV
+    speculated: bool = False  # audio is unchanged since the last `speculate()`
+
+
+class UtteranceAssembler:
+    """Puts client audio chunks together into complete utterances.
+
+    The client streams 16-bit little-endian mono PCM as binary WebSocket frames.
+    An utterance ends after `silence_ms` of audio below the energy threshold,
+    when the client sends an explicit "end" frame (`flush`), or when it reaches
+    `max_seconds`. A binary frame holding a complete WAV file is treated as a
+    whole utterance on its own.
+
+    After a shorter `speculate_ms` pause, `speculate()` hands out the utterance
+    so far so it can be processed before the end-of-utterance silence elapses.
+    If the speaker resumes, `speculating` turns False and the snapshot is stale.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = Config.AUDIO_SAMPLE_RATE,
+        silence_rms: int = Config.AUDIO_SILENCE_RMS,
+        silence_ms: int = Config.UTTERANCE_SILENCE_MS,
+        min_voiced_ms: int = Config.UTTERANCE_MIN_VOICED_MS,
+        max_seconds: int = Config.UTTERANCE_MAX_SECONDS,
+        speculate_ms: int = Config.UTTERANCE_SPECULATE_MS,
+    ):
+        self.sample_rate = sample_rate
+        self.silence_rms = silence_rms
+        self.frame_bytes = sample_rate * FRAME_MS // 1000 * SAMPLE_WIDTH
+        self.silence_frames = max(silence_ms // FRAME_MS, 1)
+        self.min_voiced_frames = max(min_voiced_ms // FRAME_MS, 1)
+        self.pre_roll_frames = PRE_ROLL_MS // FRAME_MS
+        self.max_frames = max_seconds * 1000 // FRAME_MS
+        self.speculate_frames = speculate_ms // FRAME_MS
+
+        self._pending = bytearray()  # partial frame carried over between chunks
+        self._frames: List[bytes] = []
+        self._voiced_frames = 0
+        self._trailing_silence = 0
+        self.speculating = False
+
+    def feed(self, chunk: bytes) -> List[Utterance]:
+        """Adds a chunk and returns every utterance it completed."""
+        if is_wav(chunk):
+            completed = [utterance for utterance in [self.flush()] if utterance]
+            return completed + [Utterance(chunk)]
+
+        self._pending.extend(chunk)
+        usable = len(self._pending) - len(self._pending) % self.frame_bytes
+        if not usable:
+            return []
+
+        samples = np.frombuffer(bytes(self._pending[:usable]), dtype="<i2")
+        del self._pending[:usable]
+        frames = samples.reshape(-1, self.frame_bytes // SAMPLE_WIDTH)
+        rms = frame_rms(samples, self.frame_bytes // SAMPLE_WIDTH)
+
+        completed = []
+        for frame, energy in zip(frames, rms):
+            utterance = self._add_frame(frame.tobytes(), energy >= self.silence_rms)
+            if utterance:
+                completed.append(utterance)
+        return completed
+
+    def speculate(self) -> Optional[bytes]:
+        """Returns the utterance so far once per pause of `speculate_ms`."""
+        if (
+            not self.speculate_frames
+            or self.speculating
+            or self._voiced_frames < self.min_voiced_frames
+            or self._trailing_silence < self.speculate_frames
+        ):
+            return None
+
+        self.speculating = True
+        return pcm_to_wav(b"".join(self._frames), self.sample_rate)
+
+    def flush(self) -> Optional[Utterance]:
+        """Ends the current utterance, e.g. on an explicit client "end" frame."""
+        if self._pending:
+            self._frames.append(bytes(self._pending))
+            self._pending.clear()
+            self.speculating = False
+        return self._finish()
+
+    def _add_frame(self, frame: bytes, voiced: bool) -> Optional[Utterance]:
+        self._frames.append(frame)
+
+        if voiced:
+            self._voiced_frames += 1
+            self._trailing_silence = 0
+            self.speculating = False
+        elif self._voiced_frames:
+            self._trailing_silence += 1
+        else:
+            # keep a short pre-roll of silence so word onsets are not clipped
+            del self._frames[: -self.pre_roll_frames or len(self._frames)]
+            return None
+
+        if (
+            self._trailing_silence >= self.silence_frames
+            or len(self._frames) >= self.max_frames
+        ):
+            return self._finish()
+        return None
+
+    def _finish(self) -> Optional[Utterance]:
+        frames, voiced, speculated = self._frames, self._voiced_frames, self.speculating
+        self._frames = []
+        self._voiced_frames = 0
+        self._trailing_silence = 0
+        self.speculating = False
+
+        if voiced < self.min_voiced_frames:
+            return None
+        return Utterance(pcm_to_wav(b"".join(frames), self.sample_rate), speculated)
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncContextManager, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import Config
+from src.conversation.crud import conversation_crud
+from utils.db.session import async_session_scope
+
+
+class ConversationBuffer:
+    """Write-behind buffer for the turns of one conversation session.
+
+    Turns are collected in memory and written with a single multi-row INSERT
+    when `max_rows` are pending, `interval` seconds after the first pending turn,
+    or when the session ends. Each flush is its own short unit of work, so no
+    connection is held between flushes. `close` writes the last batch into the
+    caller's session so it commits together with the session's `Report`.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        created_by: str,
+        max_rows: int = Config.CONVERSATION_FLUSH_ROWS,
+        interval: float = Config.CONVERSATION_FLUSH_SECONDS,
+        session_factory: Callable[
+            [], AsyncContextManager[AsyncSession]
+        ] = async_session_scope,
+    ):
+        self.session_factory = session_factory
+        self.session_id = session_id
+        self.created_by = created_by
+        self.max_rows = max_rows
+        self.interval = interval
+        self._rows: List[dict] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    async def add(self, role: str, content: str):
+        now = datetime.now()
+        self._rows.append(
+            {
+                "role": role,
+                "content": content,
+                "session_id": self.session_id,
+                "created_at": now,
+                "updated_at": now,
+                "created_by": self.created_by,
+                "updated_by": self.created_by,
+            }
+        )
+
+        if len(self._rows) >= self.max_rows:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+            self._timer.add_done_callback(self._timer_done)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        await self.flush()
+
+    @staticmethod
+    def _timer_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            print(f"Conversation Buffer Error: {task.exception()!r}")
+
+    def _take(self) -> List[dict]:
+        # a flush from the timer itself must not cancel it
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+
+        rows, self._rows = self._rows, []
+        return rows
+
+    def _put_back(self, rows: List[dict]):
+        self._rows = rows + self._rows
+
+    async def flush(self):
+        """Writes the pending turns. On failure they are kept for the next flush."""
+        rows = self._take()
+        if not rows:
+            return
+        try:
+            async with self.session_factory() as db:
+                await conversation_crud.add_many(db, rows)
+        except Exception as e:
+            print(f"Conversation Buffer Error: {e!r}, keeping {len(rows)} turns")
+            self._put_back(rows)
+
+    async def close(self, db: AsyncSession):
+        """Writes the pending turns into `db` without committing them."""
+        rows = self._take()
+        if not rows:
+            return
+        try:
+            await conversation_crud.add_many(db, rows)
+        except Exception:
+            self._put_back(rows)
+            raise
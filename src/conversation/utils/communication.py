@@ -1,40 +1,45 @@
 import asyncio
+import json
+import re
 from datetime import datetime, timedelta
+from typing import List, Optional
 
-import pyttsx3
-import requests
-import speech_recognition as sr
+import httpx
 from fastapi import WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
 
-from src.category.models import Topic
+from src.category.crud import async_topic_crud, leaderboard_crud
+from src.category.utils.leaderboard import (
+    LeaderboardEntry,
+    display_name,
+    leaderboard_cache,
+)
 from src.config import Config
-from src.conversation.crud import conversation_crud, conversation_session_crud
-from src.conversation.models import Report
-from src.conversation.utils.score import calculate_score
+from src.conversation.crud import conversation_session_crud, report_crud
+from src.conversation.schemas import StreamMode
+from src.conversation.utils.audio import UtteranceAssembler, acoustic_metrics
+from src.conversation.utils.buffer import ConversationBuffer
+from src.conversation.utils.score import ScoreAccumulator, scoring_engine
+from src.conversation.utils.tts import topic_intro, tts
+from src.user.crud import user_stats_crud
+from utils.db.session import async_session_scope
+from utils.http.client import http_pool
 
 TOGETHER_AI_API_KEY = Config.TOGETHER_AI_API_KEY
 GROQ_KEY = Config.GROQ_KEY
 
 
-engine = pyttsx3.init()
-
-
-def speak(response):
-    if response:
-        print("Assistant:", response)
-        print("AI:", response)
-        engine.say(response)
-        engine.runAndWait()
-
-
-def transcribe_with_groq(audio_data):
+async def transcribe_with_groq(audio_data):
     url = "https://api.groq.com/openai/v1/audio/transcriptions"
     headers = {"Authorization": f"Bearer {GROQ_KEY}"}
     files = {"file": ("audio.wav", audio_data, "audio/wav")}
     payload = {"model": "whisper-large-v3", "response_format": "json"}
 
-    response = requests.post(url, headers=headers, files=files, data=payload)
+    try:
+        response = await http_pool.post(url, headers=headers, files=files, data=payload)
+    except httpx.HTTPError as e:
+        print(f"Groq API Error: {e!r}")
+        return None
+
     if response.status_code == 200:
         data = response.json()
         return data.get("text", ""), data.get("confidence", 0)
@@ -43,9 +48,11 @@ def transcribe_with_groq(audio_data):
         return None
 
 
-def get_ai_response(query):
-    """Generates AI response using Groq API."""
-    url = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _chat_request(query, stream=False):
     headers = {
         "Authorization": f"Bearer {GROQ_KEY}",
         "Content-Type": "application/json",
@@ -55,9 +62,20 @@ def get_ai_response(query):
         "messages": [{"role": "user", "content": query}],
         "max_tokens": 20,
         "temperature": 0.7,
+        "stream": stream,
     }
+    return headers, payload
+
 
-    response = requests.post(url, headers=headers, json=payload)
+async def get_ai_response(query):
+    """Generates AI response using Groq API."""
+    headers, payload = _chat_request(query)
+
+    try:
+        response = await http_pool.post(GROQ_CHAT_URL, headers=headers, json=payload)
+    except httpx.HTTPError as e:
+        print(f"Groq API Error: {e!r}")
+        return None
 
     if response.status_code == 200:
         return (
@@ -71,72 +89,338 @@ def get_ai_response(query):
         return None
 
 
+async def stream_ai_response(query):
+    """Yields the AI response token by token from Groq's streamed completions."""
+    headers, payload = _chat_request(query, stream=True)
+
+    try:
+        async with http_pool.stream(
+            "POST", GROQ_CHAT_URL, headers=headers, json=payload
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                print(f"Groq API Error: {response.status_code}")
+                return
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line.removeprefix("data:").strip()
+                if data == "[DONE]":
+                    return
+
+                choices = json.loads(data).get("choices") or [{}]
+                token = choices[0].get("delta", {}).get("content")
+                if token:
+                    yield token
+    except httpx.HTTPError as e:
+        print(f"Groq API Error: {e!r}")
+
+
+class SentenceSplitter:
+    """Buffers streamed tokens and releases them one complete sentence at a time."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def push(self, token: str) -> List[str]:
+        self._buffer += token
+        *sentences, self._buffer = SENTENCE_END.split(self._buffer)
+        return [sentence for sentence in sentences if sentence.strip()]
+
+    def flush(self) -> List[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+async def generate_ai_response(query, stream: Optional[StreamMode] = None):
+    """Yields the AI reply token by token when streaming, otherwise in one piece."""
+    if stream:
+        async for token in stream_ai_response(query):
+            yield token
+    else:
+        ai_response = await get_ai_response(query)
+        if ai_response:
+            yield ai_response
+
+
+class Turn:
+    """One user utterance on its way through transcription, reply and speech.
+
+    Work starts as soon as the turn is created, so a turn can be transcribed,
+    answered and synthesized while earlier turns are still being sent to the
+    client.
+    """
+
+    def __init__(self, audio: bytes, stream: Optional[StreamMode] = None):
+        loop = asyncio.get_running_loop()
+        self.audio = audio
+        self.transcript = loop.create_future()
+        self.reply = asyncio.Queue()  # reply pieces, terminated by None
+        self.speech = loop.create_future()  # WAV bytes of the reply
+        self.task = asyncio.create_task(self._prepare(stream))
+
+    async def _prepare(self, stream: Optional[StreamMode]):
+        pieces = []
+        try:
+            transcript = await transcribe_with_groq(self.audio)
+            transcription, confidence = transcript or ("", 0)
+            self.transcript.set_result((transcription, confidence))
+
+            if transcription:
+                async for piece in generate_ai_response(transcription, stream):
+                    pieces.append(piece)
+                    self.reply.put_nowait(piece)
+        except Exception as e:
+            if self.transcript.done():
+                print(f"AI response failed: {e!r}")
+            else:
+                self.transcript.set_exception(e)
+        finally:
+            self.reply.put_nowait(None)
+
+        self.speech.set_result(await tts.synthesize("".join(pieces).strip()))
+
+    def cancel(self):
+        self.task.cancel()
+
+
+class ConversationPipeline:
+    """Pipelines capture, transcription and reply generation within a session.
+
+    A receiver task assembles utterances from the socket and starts a `Turn` for
+    each one straight away; a responder task takes the turns in the order they
+    were spoken and sends and persists them one at a time. When the speaker
+    pauses, a speculative turn is started on the utterance so far and kept if
+    the utterance ends without further speech.
+
+    Every transcribed turn is scored in the background as it arrives. With
+    `live_score` the running session score is sent as a `{"type": "score"}`
+    JSON frame after each turn.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        buffer: ConversationBuffer,
+        end_time: datetime,
+        sample_rate: int = Config.AUDIO_SAMPLE_RATE,
+        stream: Optional[StreamMode] = None,
+        live_score: bool = False,
+    ):
+        self.websocket = websocket
+        self.buffer = buffer
+        self.end_time = end_time
+        self.stream = stream
+        self.live_score = live_score
+        self.assembler = UtteranceAssembler(sample_rate=sample_rate)
+
+        self.turns = asyncio.Queue()  # turns in spoken order, terminated by None
+        self.score = ScoreAccumulator()
+        self._tasks = set()
+        self._scoring = set()  # outlive the pipeline, see `scored`
+
+    async def run(self):
+        receiver = asyncio.create_task(self._receive())
+        responder = asyncio.create_task(self._respond())
+        try:
+            done, _ = await asyncio.wait(
+                {receiver, responder}, return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                task.result()
+            await responder
+        finally:
+            for task in (receiver, responder, *self._tasks):
+                task.cancel()
+
+    def _start_turn(self, audio: bytes) -> Turn:
+        turn = Turn(audio, self.stream)
+        self._tasks.add(turn.task)
+        turn.task.add_done_callback(self._tasks.discard)
+        return turn
+
+    async def _receive(self):
+        speculative: Optional[Turn] = None
+
+        while True:
+            remaining = (self.end_time - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+
+            try:
+                message = await asyncio.wait_for(
+                    self.websocket.receive(), timeout=remaining
+                )
+            except asyncio.TimeoutError:
+                break
+
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                utterances = self.assembler.feed(message["bytes"])
+            elif (message.get("text") or "").strip().lower() == "end":
+                utterances = [self.assembler.flush()]
+            else:
+                continue
+
+            for utterance in filter(None, utterances):
+                if speculative and utterance.speculated:
+                    turn, speculative = speculative, None
+                else:
+                    turn = self._start_turn(utterance.audio)
+                await self.turns.put(turn)
+
+            if speculative and not self.assembler.speculating:
+                # the speaker carried on, the early transcript is stale
+                speculative.cancel()
+                speculative = None
+
+            snapshot = self.assembler.speculate()
+            if snapshot:
+                speculative = self._start_turn(snapshot)
+
+        if speculative:
+            speculative.cancel()
+        await self.turns.put(None)
+
+    async def _respond(self):
+        while (turn := await self.turns.get()) is not None:
+            try:
+                transcription, confidence = await turn.transcript
+            except Exception as e:
+                # one bad STT reply must not end the conversation
+                print(f"Transcription failed: {e!r}")
+                transcription = None
+            if not transcription:
+                await self.websocket.send_text("Error: Could not transcribe audio.")
+                continue
+
+            print("User:", transcription)
+            self._start_scoring(turn, transcription, confidence)
+
+            await self.buffer.add("user", transcription)
+
+            ai_response = await self._send_reply(turn)
+            if ai_response:
+                print("AI:", ai_response)
+                await self.buffer.add("ai", ai_response)
+
+                speech = await turn.speech
+                if speech:
+                    await self.websocket.send_bytes(speech)
+            else:
+                await self.websocket.send_text(
+                    "Error: AI could not generate a response."
+                )
+
+    def _start_scoring(self, turn: Turn, transcription: str, confidence: float):
+        task = asyncio.create_task(
+            self._score_turn(turn.audio, transcription, confidence)
+        )
+        self._scoring.add(task)
+        task.add_done_callback(self._scoring.discard)
+
+    async def _score_turn(self, audio: bytes, transcription: str, confidence: float):
+        acoustics = await asyncio.to_thread(acoustic_metrics, audio)
+        sub_scores, words = await scoring_engine.score_turn(
+            transcription, confidence, acoustics
+        )
+        self.score.add(sub_scores, words)
+        if self.live_score:
+            await self.websocket.send_json(
+                {
+                    "type": "score",
+                    "score": self.score.score,
+                    "words": self.score.words,
+                    "breakdown": self.score.breakdown(),
+                }
+            )
+
+    async def scored(self) -> ScoreAccumulator:
+        """Waits for the turns still being scored and returns the session's score."""
+        await asyncio.gather(*self._scoring, return_exceptions=True)
+        return self.score
+
+    async def _send_reply(self, turn: Turn) -> Optional[str]:
+        """Sends a turn's AI reply to the client and returns the assembled text.
+
+        Without `stream` the whole reply is sent as one text frame once it is
+        complete. With a stream mode, partial replies are sent as
+        `{"type": "ai_partial"}` JSON frames (one per token or per sentence) as
+        they arrive, followed by the assembled reply as an `{"type": "ai_response"}`
+        frame.
+        """
+        splitter = SentenceSplitter() if self.stream == StreamMode.SENTENCES else None
+        pieces = []
+        while (piece := await turn.reply.get()) is not None:
+            pieces.append(piece)
+            if self.stream:
+                for part in splitter.push(piece) if splitter else [piece]:
+                    await self.websocket.send_json({"type": "ai_partial", "text": part})
+
+        for part in splitter.flush() if splitter else []:
+            await self.websocket.send_json({"type": "ai_partial", "text": part})
+
+        ai_response = "".join(pieces).strip() or None
+        if ai_response and self.stream:
+            await self.websocket.send_json({"type": "ai_response", "text": ai_response})
+        elif ai_response:
+            await self.websocket.send_text(ai_response)
+        return ai_response
+
+
 async def websocket_conversation(
-    websocket: WebSocket, db: Session, user, topic_id: str, duration: int
+    websocket: WebSocket,
+    user,
+    topic_id: str,
+    duration: int,
+    sample_rate: int = Config.AUDIO_SAMPLE_RATE,
+    stream: Optional[StreamMode] = None,
+    live_score: bool = False,
 ):
+    """Runs one spoken conversation over the WebSocket.
+
+    The session holds no DB connection while it runs: each DB step (opening the
+    session, flushing buffered turns, writing the report) is a short unit of
+    work that returns its connection to the pool when it is done.
+    """
     await websocket.accept()
 
-    topic = db.query(Topic).filter(Topic.id == topic_id).first()
+    async with async_session_scope() as db:
+        topic = await async_topic_crud.get(db, topic_id)
+        if topic:
+            await user_stats_crud.add_session(db, user.id, created_by=user.email)
+            session = await conversation_session_crud.create(
+                db, user_id=user.id, created_by=user.email, topic_id=topic_id
+            )
+
     if not topic:
         await websocket.send_text("Error: Invalid topic selected.")
         await websocket.close()
         return
 
-    session = conversation_session_crud.create(
-        db, user_id=user.id, created_by=user.email, topic_id=topic_id
-    )
-
-    recognizer = sr.Recognizer()
-    mic = sr.Microphone()
-
     start_time = datetime.now()
     end_time = start_time + timedelta(minutes=duration)
-    user_messages = []
-    stt_confidences = []
+    buffer = ConversationBuffer(session.id, user.email)
+    pipeline = ConversationPipeline(
+        websocket,
+        buffer,
+        end_time,
+        sample_rate=sample_rate,
+        stream=stream,
+        live_score=live_score,
+    )
 
     try:
-        with mic as source:
-            recognizer.adjust_for_ambient_noise(source, duration=1)
-
-            ai_intro = f"Let's talk about {topic.name}. What do you think about it?"
-            speak(ai_intro)
-            await websocket.send_text(ai_intro)
-
-            await asyncio.sleep(2)
-
-            while datetime.now() < end_time:
-                print("Listening for user input...")
-                audio = recognizer.listen(source, timeout=10)
-                audio_data = audio.get_wav_data()  # Convert audio to raw bytes
-
-                # Transcribe speech to text
-                transcription, confidence = transcribe_with_groq(audio_data) or ("", 0)
-                if transcription:
-                    user_messages.append(transcription)
-                    stt_confidences.append(confidence)
-                    print("User:", transcription)
-
-                    conversation_crud.user_conversation(
-                        db, session.id, transcription, user.email
-                    )
-
-                    # Generate AI response
-                    ai_response = get_ai_response(transcription)
-                    if ai_response:
-                        conversation_crud.ai_conversation(
-                            db, session.id, ai_response, user.email
-                        )
-
-                        speak(ai_response)
-
-                        # Send AI response back to WebSocket
-                        await websocket.send_text(ai_response)
-                    else:
-                        await websocket.send_text(
-                            "Error: AI could not generate a response."
-                        )
-                else:
-                    await websocket.send_text("Error: Could not transcribe audio.")
+        ai_intro = topic_intro(topic.name)
+        await websocket.send_text(ai_intro)
+        intro_speech = await tts.synthesize(ai_intro)
+        if intro_speech:
+            await websocket.send_bytes(intro_speech)
+
+        await pipeline.run()
 
         await websocket.send_text("Conversation time is up. Disconnecting...")
         await websocket.close()
@@ -145,28 +429,48 @@ async def websocket_conversation(
         print(f"User {user.email} disconnected")
 
     finally:
-        total_time = (datetime.now() - start_time).total_seconds() / 60
-        session.total_time = round(total_time, 2)
-
-        # Calculate session score and word count
-        session_score, total_words = calculate_score(user_messages, stt_confidences)
-
-        # Update Report
-        report = db.query(Report).filter(Report.session_id == session.id).first()
-        if report:
-            report.score = session_score
-            report.words_spoken = total_words
-        else:
-            report = Report(
+        total_time = round((datetime.now() - start_time).total_seconds() / 60, 2)
+
+        # Turns are scored as they arrive, only the last ones may still be pending
+        session_score, total_words = (await pipeline.scored()).result()
+
+        # Write the remaining turns, the total time, the Report and the totals derived
+        # from it in one transaction
+        async with async_session_scope() as db:
+            await buffer.close(db)
+            await conversation_session_crud.set_total_time(db, session.id, total_time)
+            await report_crud.upsert(
+                db,
                 user_id=user.id,
                 topic_id=topic_id,
                 session_id=session.id,
                 score=session_score,
                 words_spoken=total_words,
                 created_by=user.email,
-                updated_by=user.email,
+                pronunciation=pipeline.score.average("pronunciation"),
+            )
+            # a session without a single turn would rank with a score of 0
+            if pipeline.score.turns:
+                await leaderboard_crud.record(
+                    db,
+                    topic_id=topic_id,
+                    user_id=user.id,
+                    score=session_score,
+                    created_by=user.email,
+                )
+            await user_stats_crud.add_report(
+                db,
+                user_id=user.id,
+                score=session_score,
+                words_spoken=total_words,
+                minutes=total_time,
+                created_by=user.email,
+            )
+        if pipeline.score.turns:
+            leaderboard_cache.record(
+                topic_id,
+                LeaderboardEntry(
+                    session_score, user.id, display_name(user.firstname, user.lastname)
+                ),
             )
-            db.add(report)
-
-        db.commit()
         print(f"Session {session.id} - Score: {session_score}, Words: {total_words}")
@@ -0,0 +1,106 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from spacy.attrs import IS_ALPHA, IS_PUNCT, IS_SPACE
+
+from src.config import Config
+from src.conversation.utils.audio import AcousticMetrics
+from src.conversation.utils.nlp import models
+
+# columns of the feature matrix, one row per utterance
+TOKENS = 0  # tokens, punctuation included
+WORDS = 1  # tokens that are not punctuation
+ALPHA_RATIO = 2  # share of tokens that are alphabetic or punctuation
+QUESTION = 3  # 1 if the utterance asks a question
+CONFIDENCE = 4  # transcription confidence
+# acoustic features, NaN when the utterance audio is not available
+VOICED_SECONDS = 5
+PAUSE_RATIO = 6  # share of silence while speaking
+ENERGY_VARIATION = 7  # loudness variation of the voiced frames
+SPEECH_RATE = 8  # words per minute of voiced audio
+N_FEATURES = 9
+
+# fluent speech: a natural pace, few long pauses and some variation in loudness
+FLUENT_SPEECH_RATE = (100, 220)
+MAX_PAUSE_RATIO = 0.4
+MIN_ENERGY_VARIATION = 0.2
+
+
+def sum_segments(values: np.ndarray, lengths: Sequence[int]) -> np.ndarray:
+    """Sums consecutive runs of `lengths` rows of `values`, 0 for empty runs."""
+    lengths = np.asarray(lengths)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(int)
+    # a trailing zero row keeps every start offset valid for reduceat
+    padded = np.concatenate((values, np.zeros((1, *values.shape[1:]), values.dtype)))
+    sums = np.add.reduceat(padded, starts) if len(starts) else padded[:0]
+    sums[lengths == 0] = 0
+    return sums
+
+
+def extract_features(
+    user_content: Sequence[str],
+    stt_confidences: Sequence[float],
+    acoustics: Optional[Sequence[Optional[AcousticMetrics]]] = None,
+) -> np.ndarray:
+    """Tokenizes every utterance once and returns its features as a matrix."""
+    features = np.zeros((len(user_content), N_FEATURES), dtype=np.float32)
+    features[:, CONFIDENCE] = stt_confidences
+    features[:, QUESTION] = ["?" in text for text in user_content]
+    features[:, VOICED_SECONDS:] = np.nan
+    for row, metrics in zip(features, acoustics or []):
+        if metrics:
+            row[VOICED_SECONDS] = metrics.voiced_seconds
+            row[PAUSE_RATIO] = metrics.pause_ratio
+            row[ENERGY_VARIATION] = metrics.energy_variation
+
+    nlp = models.get("spacy")
+    docs = nlp.pipe(user_content, batch_size=Config.SCORING_BATCH_SIZE)
+    # token flags of all utterances stacked together, reduced per utterance below
+    per_doc = [doc.to_array([IS_ALPHA, IS_PUNCT, IS_SPACE]) for doc in docs]
+    if not per_doc:
+        return features
+    flags = np.concatenate(per_doc).astype(bool)
+    counted = ~flags[:, 2]  # whitespace tokens are not counted
+    columns = np.column_stack(
+        [
+            counted,
+            counted & ~flags[:, 1],
+            counted & (flags[:, 0] | flags[:, 1]),
+        ]
+    ).astype(np.int32)
+    sums = sum_segments(columns, [len(doc_flags) for doc_flags in per_doc])
+
+    tokens = sums[:, 0]
+    features[:, TOKENS] = tokens
+    features[:, WORDS] = sums[:, 1]
+    features[:, ALPHA_RATIO] = np.where(
+        tokens > 0, sums[:, 2] / np.maximum(tokens, 1), 1
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        features[:, SPEECH_RATE] = sums[:, 1] / features[:, VOICED_SECONDS] * 60
+    return features
+
+
+def apply_rubric(features: np.ndarray) -> np.ndarray:
+    """Returns the sub-scores (1 or 2) of every row, in `SUB_SCORES` order."""
+    words = features[:, WORDS]
+    rate = features[:, SPEECH_RATE]
+    fluent = (
+        (rate >= FLUENT_SPEECH_RATE[0])
+        & (rate <= FLUENT_SPEECH_RATE[1])
+        & (features[:, PAUSE_RATIO] <= MAX_PAUSE_RATIO)
+        & (features[:, ENERGY_VARIATION] >= MIN_ENERGY_VARIATION)
+    )
+    # without audio (e.g. when rescoring stored turns) fall back to the STT confidence
+    pronunciation = np.where(
+        np.isnan(features[:, VOICED_SECONDS]), features[:, CONFIDENCE] > 0.8, fluent
+    )
+    return np.column_stack(
+        [
+            features[:, ALPHA_RATIO] >= 1,  # grammar
+            words > 3,  # relevance
+            (features[:, QUESTION] > 0) | (words > 5),  # engagement
+            features[:, TOKENS] > 3,  # coherence
+            pronunciation,
+        ]
+    ).astype(np.int8) + np.int8(1)
@@ -0,0 +1,102 @@
+import os
+import resource
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+import spacy
+
+from src.config import Config
+
+
+def rss_bytes() -> int:
+    """Resident memory of the current process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # not Linux: fall back to the peak resident size (KiB)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class ModelStats:
+    load_seconds: float
+    warmup_seconds: float
+    rss_bytes: int  # resident memory the process grew by while loading
+
+
+class ModelRegistry:
+    """Loads the NLP models once per process, on first use or up front.
+
+    `preload` is meant for the gunicorn master (see gunicorn.conf.py), so that
+    forked workers share the loaded models copy-on-write instead of each
+    loading its own. Every model runs a warmup inference when it is loaded.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Callable[[Any], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]] = None,
+    ):
+        self._loaders[name] = loader
+        if warmup:
+            self._warmups[name] = warmup
+
+    def get(self, name: str) -> Any:
+        if name not in self._models:
+            with self._lock:
+                if name not in self._models:
+                    self._load(name)
+        return self._models[name]
+
+    def _load(self, name: str):
+        rss_before = rss_bytes()
+        start = time.perf_counter()
+        model = self._loaders[name]()
+        loaded = time.perf_counter()
+        if name in self._warmups:
+            self._warmups[name](model)
+        warmed = time.perf_counter()
+
+        self._stats[name] = ModelStats(
+            load_seconds=round(loaded - start, 3),
+            warmup_seconds=round(warmed - loaded, 3),
+            rss_bytes=max(rss_bytes() - rss_before, 0),
+        )
+        self._models[name] = model
+        print(f"Loaded model {name}: {self._stats[name]}")
+
+    def preload(self, *names: str):
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def stats(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": rss_bytes(),
+            "models": {name: asdict(stats) for name, stats in self._stats.items()},
+        }
+
+
+def _load_spacy():
+    # scoring only reads lexical token attributes, so only the tokenizer is needed
+    return spacy.load(
+        Config.SPACY_MODEL,
+        exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"],
+    )
+
+
+models = ModelRegistry()
+models.register(
+    "spacy", _load_spacy, warmup=lambda nlp: list(nlp.pipe(["Warm up the model."]))
+)
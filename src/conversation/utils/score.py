@@ -1,43 +1,153 @@
-import nltk
-import spacy
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence
 
-nltk.download("punkt_tab")
-from nltk.tokenize import word_tokenize
+import numpy as np
 
-nlp = spacy.load("en_core_web_sm")
+from src.config import Config
+from src.conversation.utils.audio import AcousticMetrics
+from src.conversation.utils.features import (
+    TOKENS,
+    apply_rubric,
+    extract_features,
+    sum_segments,
+)
+
+SUB_SCORES = ("grammar", "relevance", "engagement", "coherence", "pronunciation")
+PRONUNCIATION = SUB_SCORES.index("pronunciation")
+
+
+def score_turns(
+    user_content: list,
+    stt_confidences: list,
+    acoustics: Optional[List[Optional[AcousticMetrics]]] = None,
+) -> List[tuple]:
+    """Returns `(sub_scores, words)` for every utterance, in `SUB_SCORES` order."""
+    features = extract_features(user_content, stt_confidences, acoustics)
+    sub_scores = apply_rubric(features).tolist()
+    words = features[:, TOKENS].astype(int).tolist()
+    return [(tuple(scores), count) for scores, count in zip(sub_scores, words)]
+
+
+def score_sessions(
+    sessions: List[tuple], pronunciation: Optional[Sequence[Optional[float]]] = None
+) -> List[tuple]:
+    """Scores a batch of `(user_content, stt_confidences)` sessions in one pass.
+
+    `pronunciation` optionally gives each session's average pronunciation
+    sub-score, used instead of the one computed from the text (which without
+    audio can only go by the STT confidence). None entries are computed.
+
+    Returns `(score, words)` per session, as `calculate_score` does.
+    """
+    user_content = [text for messages, _ in sessions for text in messages]
+    stt_confidences = [c for _, confidences in sessions for c in confidences]
+    features = extract_features(user_content, stt_confidences)
+    turn_scores = apply_rubric(features)
+
+    counts = np.array([len(messages) for messages, _ in sessions])
+    sums = sum_segments(
+        np.column_stack([turn_scores, features[:, TOKENS]]).astype(np.float64), counts
+    )
+    averages = sums[:, :-1] / np.maximum(counts, 1)[:, None]
+    for row, stored in zip(averages, pronunciation or []):
+        if stored is not None:
+            row[PRONUNCIATION] = stored
+    # an empty session scores 0
+    scores = np.where(counts > 0, averages.sum(axis=1), 0)
+    words = sums[:, -1].astype(int)
+    return [(round(float(score), 2), int(count)) for score, count in zip(scores, words)]
+
+
+class ScoreAccumulator:
+    """Running totals of a session's turn scores, so the result is O(1) at the end."""
+
+    __slots__ = ("turns", "words", "totals")
+
+    def __init__(self):
+        self.turns = 0
+        self.words = 0
+        self.totals = np.zeros(len(SUB_SCORES), dtype=np.int64)
+
+    def add(self, sub_scores: Sequence[int], words: int):
+        self.turns += 1
+        self.words += words
+        self.totals += sub_scores
+
+    @property
+    def score(self) -> float:
+        return round(float(self.totals.sum()) / self.turns, 2) if self.turns else 0
+
+    def breakdown(self) -> Dict[str, float]:
+        """The average of every sub-score so far."""
+        return {
+            name: round(float(total) / self.turns, 2) if self.turns else 0
+            for name, total in zip(SUB_SCORES, self.totals)
+        }
+
+    def average(self, name: str) -> Optional[float]:
+        """The unrounded average of one sub-score, None before the first turn."""
+        if not self.turns:
+            return None
+        return float(self.totals[SUB_SCORES.index(name)]) / self.turns
+
+    def result(self) -> tuple:
+        return self.score, self.words
 
 
 def calculate_score(user_content: list, stt_confidences: list) -> tuple:
-    total_score = 0
-    total_words = 0
+    return score_sessions([(user_content, stt_confidences)])[0]
+
+
+class ScoringEngine:
+    """Scores utterances and sessions in a bounded pool of worker processes.
+
+    The NLP work is CPU bound, so it runs outside the event loop and scoring
+    does not hold up the other connections.
+    """
 
-    for i, user_input in enumerate(user_content):
-        score = 0
-        words = word_tokenize(user_input)
-        total_words += len(words)
+    def __init__(self, workers: int = Config.SCORING_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
 
-        def grammar_score():
-            doc = nlp(user_input)
-            return 2 if all(token.is_alpha or token.is_punct for token in doc) else 1
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
 
-        def relevance_score():
-            return 2 if len(user_input.split()) > 3 else 1
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        except BrokenProcessPool as e:
+            # a worker died, score in a thread this time and start afresh next time
+            print(f"Scoring Error: {e!r}")
+            self.shutdown()
+            return await asyncio.to_thread(func, *args)
 
-        def engagement_score():
-            return 2 if "?" in user_input or len(user_input.split()) > 5 else 1
+    async def score(self, user_content: List[str], stt_confidences: List[float]):
+        if not user_content:
+            return calculate_score(user_content, stt_confidences)
+        return await self._run(calculate_score, user_content, stt_confidences)
 
-        def coherence_score():
-            return 2 if len(words) > 3 else 1
+    async def score_turn(
+        self,
+        user_input: str,
+        stt_confidence: float,
+        acoustics: Optional[AcousticMetrics] = None,
+    ) -> tuple:
+        """Returns `(sub_scores, words)` for a single utterance."""
+        turns = await self._run(
+            score_turns, [user_input], [stt_confidence], [acoustics]
+        )
+        return turns[0]
 
-        def pronunciation_score():
-            return 2 if stt_confidences[i] > 0.8 else 1
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
-        score += grammar_score()
-        score += relevance_score()
-        score += engagement_score()
-        score += coherence_score()
-        score += pronunciation_score()
-        total_score += score
 
-    avg_score = round(total_score / len(user_content), 2) if user_content else 0
-    return avg_score, total_words
+scoring_engine = ScoringEngine()
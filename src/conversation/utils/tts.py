@@ -0,0 +1,139 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import pyttsx3
+
+from src.config import Config
+from src.conversation.utils.tts_cache import SpeechCache, speech_cache, speech_key
+
+# render into tmpfs when available so synthesized audio never touches the disk
+SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+_engine = None  # one pyttsx3 engine per worker process, it is not thread-safe
+
+
+def topic_intro(topic_name: str) -> str:
+    return f"Let's talk about {topic_name}. What do you think about it?"
+
+
+def _init_worker(voice: Optional[str], rate: int):
+    global _engine
+    _engine = pyttsx3.init()
+    _engine.setProperty("rate", rate)
+    if voice:
+        _engine.setProperty("voice", voice)
+
+
+def _render(text: str) -> bytes:
+    fd, path = tempfile.mkstemp(suffix=".wav", dir=SCRATCH_DIR)
+    os.close(fd)
+    try:
+        _engine.save_to_file(text, path)
+        _engine.runAndWait()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+class SpeechSynthesizer:
+    """Renders speech to WAV bytes in a bounded pool of worker processes.
+
+    Synthesis runs off the event loop, so one session's reply does not hold up
+    the others, and the audio is returned to the caller instead of being played
+    on the server. Rendered audio goes through `cache`, so repeated phrases such
+    as topic intros are synthesized once.
+    """
+
+    def __init__(
+        self,
+        workers: int = Config.TTS_WORKERS,
+        voice: Optional[str] = Config.TTS_VOICE,
+        rate: int = Config.TTS_RATE,
+        cache: SpeechCache = speech_cache,
+    ):
+        self.workers = workers
+        self.voice = voice
+        self.rate = rate
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.voice, self.rate),
+            )
+        return self._executor
+
+    def _key(self, text: str) -> str:
+        return speech_key(text, self.voice, self.rate)
+
+    async def synthesize(self, text: str) -> Optional[bytes]:
+        if not text:
+            return None
+
+        key = self._key(text)
+        audio = self.cache.get_memory(key) or await asyncio.to_thread(
+            self.cache.get, key
+        )
+        if audio:
+            return audio
+
+        loop = asyncio.get_running_loop()
+        try:
+            audio = await loop.run_in_executor(self.executor, _render, text)
+        except BrokenProcessPool as e:
+            # a worker died (e.g. the TTS driver failed to start), start afresh next time
+            print(f"TTS Error: {e!r}")
+            self.shutdown()
+            return None
+        except Exception as e:
+            print(f"TTS Error: {e!r}")
+            return None
+
+        await asyncio.to_thread(self._store, key, audio)
+        return audio
+
+    def _store(self, key: str, audio: bytes):
+        # the audio is still good when it cannot be cached (full disk...)
+        try:
+            self.cache.put(key, audio)
+        except Exception as e:
+            print(f"TTS cache write failed: {e!r}")
+
+    def prefetch(self, text: str):
+        """Renders `text` into the cache in the background unless already cached."""
+        key = self._key(text)
+        if self.cache.contains(key):
+            return
+
+        try:
+            future = self.executor.submit(_render, text)
+        except BrokenProcessPool as e:
+            print(f"TTS Error: {e!r}")
+            self.shutdown()
+            return
+        future.add_done_callback(lambda f: self._store_prefetched(key, f))
+
+    def _store_prefetched(self, key: str, future):
+        if future.cancelled():
+            return
+        if future.exception():
+            print(f"TTS prefetch failed: {future.exception()!r}")
+            return
+        self._store(key, future.result())
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+tts = SpeechSynthesizer()
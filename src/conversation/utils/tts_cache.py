@@ -0,0 +1,147 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from src.config import Config
+
+MB = 1024 * 1024
+
+
+def speech_key(text: str, voice: Optional[str], rate: int) -> str:
+    return hashlib.sha256(f"{voice}\0{rate}\0{text}".encode()).hexdigest()
+
+
+class SpeechCache:
+    """Content-addressed store of synthesized speech.
+
+    Audio is keyed by `speech_key(text, voice, rate)` and kept in an in-memory
+    LRU tier capped by total bytes, backed by an on-disk store of `<key>.wav`
+    files. When the disk store grows past its cap, the least recently used
+    files (by mtime, refreshed on every hit) are evicted.
+
+    Every worker shares the directory but only counts its own writes, so the
+    usage is rescanned at least every `rescan_seconds` and always before
+    evicting. The store can overshoot its cap by what the other workers wrote
+    since the last scan.
+    """
+
+    rescan_seconds = 60
+
+    def __init__(
+        self,
+        directory: str = Config.TTS_CACHE_DIR,
+        memory_bytes: int = Config.TTS_CACHE_MEMORY_MB * MB,
+        disk_bytes: int = Config.TTS_CACHE_DISK_MB * MB,
+    ):
+        self.directory = directory
+        self.disk_limit = disk_bytes
+        self._memory = LRUCache(maxsize=memory_bytes, getsizeof=len)
+        self._disk_usage: Optional[int] = None  # computed on first write
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def contains(self, key: str) -> bool:
+        return self.get_memory(key) is not None or os.path.exists(self._path(key))
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._memory.get(key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Looks the key up in memory, then on disk (promoting disk hits)."""
+        audio = self.get_memory(key)
+        if audio is not None:
+            return audio
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+
+        self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        self._remember(key, audio)
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            stale = (
+                self._disk_usage is None
+                or time.monotonic() - self._scanned_at > self.rescan_seconds
+            )
+            if not stale:
+                self._disk_usage += len(audio) - replaced
+                # count what the other workers wrote before evicting anything
+                stale = self._disk_usage > self.disk_limit
+            if stale:
+                self._rescan()
+            if self._disk_usage > self.disk_limit:
+                self._evict()
+
+    def _remember(self, key: str, audio: bytes):
+        if len(audio) <= self._memory.maxsize:
+            with self._lock:
+                self._memory[key] = audio
+
+    def _entries(self) -> List[os.DirEntry]:
+        """The finished audio files, not the temp files other writers are filling."""
+        return [e for e in os.scandir(self.directory) if e.name.endswith(".wav")]
+
+    def _stats(self) -> List[Tuple[str, os.stat_result]]:
+        """Paths and stats of the audio files, skipping the ones just deleted."""
+        stats = []
+        for entry in self._entries():
+            try:
+                stats.append((entry.path, entry.stat()))
+            except OSError:
+                continue
+        return stats
+
+    def _rescan(self):
+        self._disk_usage = sum(stat.st_size for _, stat in self._stats())
+        self._scanned_at = time.monotonic()
+
+    def _evict(self):
+        # drop the least recently used files until the store is at 90% of its cap
+        files = sorted(self._stats(), key=lambda file: file[1].st_mtime)
+        target = self.disk_limit * 0.9
+        for path, stat in files:
+            if self._disk_usage <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._disk_usage -= stat.st_size
+
+
+speech_cache = SpeechCache()
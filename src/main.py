@@ -6,6 +6,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.config import Config
+from src.conversation.utils.nlp import models
+from src.conversation.utils.score import scoring_engine
+from src.conversation.utils.tts import tts
+from utils.http.client import http_pool
 
 format = "%(levelname)s:%(funcName)s:%(message)s"
 logging.basicConfig(level=Config.LOG_LEVEL, format=format)
@@ -45,6 +49,14 @@ def create_app():
             allow_headers=["*"],
         )
 
+    # release pooled outgoing HTTP connections
+    app.add_event_handler("shutdown", http_pool.aclose)
+    app.add_event_handler("shutdown", tts.shutdown)
+    app.add_event_handler("shutdown", scoring_engine.shutdown)
+    # load the NLP models before serving rather than on first use
+    if Config.NLP_PRELOAD:
+        app.add_event_handler("startup", models.preload)
+
     # Include API handler router
     from src.api_handler import api_router
 
@@ -7,6 +7,7 @@ from fastapi.responses import RedirectResponse
 
 from src.billing.crud import stripe_service
 from src.user.crud import user_crud
+from src.user.models import UserRoles
 from src.user.schemas import (
     ForgotRequest,
     LoginRequest,
@@ -16,7 +17,13 @@ from src.user.schemas import (
     UserRequest,
     UserStatsResponse,
 )
-from src.user.utils.deps import auth_provider, authenticated_user, verify_reset_token
+from src.user.utils.cache import token_cache, user_cache
+from src.user.utils.deps import (
+    auth_provider,
+    authenticated_user,
+    is_authorized_for,
+    verify_reset_token,
+)
 from src.user.utils.utils import get_sso_user, send_reset_email
 from utils.db.session import get_db
 
@@ -113,9 +120,9 @@ def reset_password(request: ResetRequest, db: get_db):
 def get_user_stats(authenticated: authenticated_user):
     user, db = authenticated
 
-    stats = user_crud.get_user_stats(db, user.id)
+    return user_crud.get_user_stats(db, user.id)
 
-    if stats.total_session == 0:
-        return UserStatsResponse(total_session=0, avg_score=0.0, high_score=0.0)
 
-    return stats
+@user_router.get("/auth-cache", status_code=status.HTTP_200_OK)
+def get_auth_cache_stats(_: is_authorized_for([UserRoles.ADMIN.value])):
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
@@ -0,0 +1,21 @@
+"""Builds the `user_stats` rows of existing users from their sessions and reports.
+
+    python -m src.user.backfill_stats
+
+Safe to run again at any time, every row is recomputed from scratch.
+"""
+import time
+
+from src.user.crud import user_stats_crud
+from utils.db.session import SessionLocal
+
+
+def main():
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        users = user_stats_crud.backfill(db)
+    print(f"Backfilled stats of {users} users in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
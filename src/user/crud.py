@@ -1,13 +1,17 @@
+from datetime import datetime
 from typing import Any, Dict, Union
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
 from src.conversation.models import ConversationSession, Report
-from src.user.models import User
+from src.user.models import User, UserStats
 from src.user.schemas import UserBase, UserStatsResponse, UserUpdate
-from utils.crud.base import CRUDBase
+from utils.crud.base import CRUDBase, set_changed_columns
 
 
 # user crud
@@ -28,45 +32,146 @@ class UserCRUD(CRUDBase[User, UserBase, UserUpdate]):
     def update(
         self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
     ) -> User:
-        obj_data: dict = jsonable_encoder(db_obj, exclude_unset=True)
-        password = obj_data.pop("password", None)
         if isinstance(obj_in, dict):
-            update_data = obj_in
+            update_data = dict(obj_in)
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        # a new password is hashed, it is never copied over as is
+        password = update_data.pop("password", None)
+        changed = set_changed_columns(db_obj, update_data)
         if password:
             db_obj.set_password(password)
-        db.add(db_obj)
-        db.commit()
+        if changed or password:
+            db.add(db_obj)
+            db.commit()
         return db_obj
 
     def get_user_stats(self, db: Session, user_id: str) -> UserStatsResponse:
-        total_session = db.query(ConversationSession).filter_by(user_id=user_id).count()
-
-        avg_score = (
-            db.query(func.avg(Report.score))
-            .join(ConversationSession)
-            .filter(ConversationSession.user_id == user_id)
-            .scalar()
-            or 0
-        )
-
-        high_score = (
-            db.query(func.max(Report.score))
-            .join(ConversationSession)
-            .filter(ConversationSession.user_id == user_id)
-            .scalar()
-            or 0
-        )
+        stats = db.get(UserStats, user_id)
+        if not stats:
+            return UserStatsResponse(total_session=0, avg_score=0.0, high_score=0.0)
 
+        avg_score = stats.score_sum / stats.report_count if stats.report_count else 0
         return UserStatsResponse(
-            total_session=total_session,
+            total_session=stats.session_count,
             avg_score=round(avg_score, 2),
-            high_score=round(high_score, 2),
+            high_score=round(stats.score_max or 0, 2),
+            total_minutes=round(stats.total_minutes, 2),
+            words_spoken=stats.words_spoken,
         )
 
 
 user_crud = UserCRUD(User)
+
+
+class UserStatsCRUD:
+    @staticmethod
+    async def _upsert(db: AsyncSession, user_id: str, created_by: str, **changes):
+        stmt = insert(UserStats).values(
+            id=user_id,
+            created_by=created_by,
+            updated_by=created_by,
+            **{column: value for column, (value, _) in changes.items()},
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserStats.id],
+                set_={
+                    **{column: update for column, (_, update) in changes.items()},
+                    "updated_at": datetime.now(),
+                    "updated_by": created_by,
+                },
+            )
+        )
+
+    async def add_session(self, db: AsyncSession, user_id: str, created_by: str):
+        """Counts a new session for the user, without committing."""
+        await self._upsert(
+            db,
+            user_id,
+            created_by,
+            session_count=(1, UserStats.session_count + 1),
+        )
+
+    async def add_report(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        score: float,
+        words_spoken: int,
+        minutes: float,
+        created_by: str,
+    ):
+        """Adds a finished session's report to the user's totals, without committing."""
+        await self._upsert(
+            db,
+            user_id,
+            created_by,
+            report_count=(1, UserStats.report_count + 1),
+            score_sum=(score, UserStats.score_sum + score),
+            score_max=(score, func.greatest(UserStats.score_max, score)),
+            total_minutes=(minutes, UserStats.total_minutes + minutes),
+            words_spoken=(words_spoken, UserStats.words_spoken + words_spoken),
+        )
+
+    @staticmethod
+    def backfill(db: Session, created_by: str = "system") -> int:
+        """Recomputes the stats of every user from their sessions and reports."""
+        sessions = (
+            select(
+                ConversationSession.user_id,
+                func.count().label("session_count"),
+                func.sum(ConversationSession.total_time).label("total_minutes"),
+            )
+            .group_by(ConversationSession.user_id)
+            .subquery()
+        )
+        reports = (
+            select(
+                Report.user_id,
+                func.count().label("report_count"),
+                func.sum(Report.score).label("score_sum"),
+                func.max(Report.score).label("score_max"),
+                func.sum(Report.words_spoken).label("words_spoken"),
+            )
+            .group_by(Report.user_id)
+            .subquery()
+        )
+        totals = (
+            select(
+                User.id,
+                func.coalesce(sessions.c.session_count, 0),
+                func.coalesce(reports.c.report_count, 0),
+                func.coalesce(reports.c.score_sum, 0),
+                reports.c.score_max,
+                func.coalesce(sessions.c.total_minutes, 0),
+                func.coalesce(reports.c.words_spoken, 0),
+                literal(created_by),
+                literal(created_by),
+            )
+            .outerjoin(sessions, sessions.c.user_id == User.id)
+            .outerjoin(reports, reports.c.user_id == User.id)
+        )
+        columns = [
+            "id",
+            "session_count",
+            "report_count",
+            "score_sum",
+            "score_max",
+            "total_minutes",
+            "words_spoken",
+            "created_by",
+            "updated_by",
+        ]
+        stmt = insert(UserStats).from_select(columns, totals)
+        result = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserStats.id],
+                set_={column: stmt.excluded[column] for column in columns[1:-2]},
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+
+user_stats_crud = UserStatsCRUD()
@@ -3,7 +3,7 @@ from enum import Enum
 
 import jwt
 from passlib.hash import pbkdf2_sha256
-from sqlalchemy import Boolean, Column, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.billing.models import Invoice, Payment, Subscription
@@ -32,6 +32,8 @@ class User(ModelBase):
     is_active = Column(Boolean, default=True)
     is_banned = Column(Boolean, default=False)
     used_conversations = Column(Integer, default=0)
+    # the subscription period `used_conversations` counts towards
+    quota_period_end = Column(DateTime, nullable=True)
 
     session = relationship(
         ConversationSession, back_populates="user", cascade="all, delete"
@@ -77,3 +79,19 @@ class User(ModelBase):
             key=Config.JWT_SECRET_KEY,
             algorithm=Config.JWT_ALGORITHM,
         )
+
+
+class UserStats(ModelBase):
+    """Running conversation totals of a user, keyed by the user's id.
+
+    Kept up to date in the same transactions that open a session and write its
+    report, so reading a user's stats is a primary key lookup.
+    """
+
+    id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    report_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    score_max = Column(Float, nullable=True)
+    total_minutes = Column(Float, nullable=False, default=0)
+    words_spoken = Column(Integer, nullable=False, default=0)
@@ -60,3 +60,5 @@ class UserStatsResponse(BaseModel):
     total_session: int
     avg_score: float
     high_score: float
+    total_minutes: float = 0
+    words_spoken: int = 0
@@ -0,0 +1,178 @@
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+from cachetools import LRUCache, TTLCache
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Session,
+    make_transient_to_detached,
+    object_session,
+)
+
+from src.config import Config
+from src.user.models import User
+
+
+class UserCache:
+    """Per-worker cache of the authenticated users' column values.
+
+    Every hit builds a new detached `User` from the snapshot, so requests never
+    share an instance. Changes committed by this worker (a ban, deactivation,
+    role change...) drop the user's entry right away; other workers pick them up
+    once the entry expires after `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        size: int = Config.USER_CACHE_SIZE,
+        ttl: float = Config.USER_CACHE_TTL_SECONDS,
+    ):
+        self._snapshots = TTLCache(maxsize=size, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[User]:
+        with self._lock:
+            snapshot = self._snapshots.get(user_id)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        user = User(**snapshot)
+        # loaded state, as if it came from a query: no pending changes
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, user: User):
+        state = inspect(user)
+        snapshot: Dict[str, Any] = {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+        with self._lock:
+            self._snapshots[user.id] = snapshot
+
+    def invalidate(self, user_id: Optional[str] = None):
+        with self._lock:
+            if user_id:
+                self._snapshots.pop(user_id, None)
+            else:
+                self._snapshots.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._snapshots),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0,
+            }
+
+
+user_cache = UserCache()
+
+
+class TokenCache:
+    """Per-worker LRU of verified JWTs and their claims.
+
+    Tokens are keyed by their SHA-256 digest, so a token's signature is checked
+    once per worker instead of on every request. A cached token is only trusted
+    until its `exp`; after that it is decoded again, which raises
+    `jwt.ExpiredSignatureError`. The returned claims must not be modified.
+    """
+
+    def __init__(self, size: int = Config.JWT_CACHE_SIZE):
+        self._claims = LRUCache(maxsize=size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            claims = self._claims.get(key)
+            if claims is not None:
+                exp = claims.get("exp")
+                if exp is None or time.time() < exp:
+                    self.hits += 1
+                    return claims
+                del self._claims[key]
+            self.misses += 1
+
+        claims = jwt.decode(
+            token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM]
+        )
+        with self._lock:
+            self._claims[key] = claims
+        return claims
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._claims),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0,
+            }
+
+
+token_cache = TokenCache()
+
+
+# Flushed changes are only dropped from the cache once they are committed, or a
+# request could cache the old row again in between. `True` stands for every user.
+_PENDING = "user_cache_pending"
+
+
+def _pending(session: Session, user_id: Optional[str] = None):
+    pending = session.info.setdefault(_PENDING, set())
+    pending.add(user_id or True)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User):
+    session = object_session(target)
+    if session is not None:
+        _pending(session, target.id)
+    else:
+        user_cache.invalidate(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_users(orm_execute_state: ORMExecuteState):
+    # UPDATE/DELETE statements skip the flush events and do not tell which
+    # users they match
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        if any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+            _pending(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    # released savepoints commit too, their changes are not visible yet
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING, ())
+    if True in pending:
+        user_cache.invalidate()
+        return
+    for user_id in pending:
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_rolled_back(session: Session, transaction):
+    # a committed transaction has already been handled, a savepoint's changes
+    # stay pending in the enclosing transaction even when it is rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
@@ -1,4 +1,4 @@
-from typing import Annotated, Tuple
+from typing import Annotated, Optional, Tuple
 
 import jwt
 from fastapi import (
@@ -14,17 +14,16 @@ from sqlalchemy.orm import Session
 from src.config import Config
 from src.user.crud import user_crud
 from src.user.models import AuthProvider, User
+from src.user.utils.cache import token_cache, user_cache
 from src.user.utils.sso import BaseSSO
 from src.user.utils.sso.google_sso import GoogleSSO
-from utils.db.session import get_db
+from utils.db.session import get_db, session_scope
 
 
 def _authenticated(authorization: str = Header(None, alias="Authorization")):
     try:
         authorization = authorization.strip().replace("Bearer ", "")
-        jwt.decode(
-            authorization, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM]
-        )
+        token_cache.decode(authorization)
 
         return True
 
@@ -35,22 +34,32 @@ def _authenticated(authorization: str = Header(None, alias="Authorization")):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
 
+def _get_user(db: Session, user_id: str) -> Optional[User]:
+    """The user from the worker's cache, else from the database."""
+    user = user_cache.get(user_id)
+    if user:
+        # attach the copy, so the handler can use and update it with its session
+        db.add(user)
+        return user
+
+    user = user_crud.get(db, id=user_id)
+    if user:
+        user_cache.put(user)
+    return user
+
+
 def _authenticated_user(
     db: get_db, authorization: str = Header(None, alias="Authorization")
 ) -> Tuple[User, Session]:
     try:
         user = None
         if authorization:
-            payload = jwt.decode(
-                authorization.split()[1],
-                Config.JWT_SECRET_KEY,
-                algorithms=[Config.JWT_ALGORITHM],
-            )
+            payload = token_cache.decode(authorization.split()[1])
             user_id = payload["id"]
             if not user_id:
                 raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
-            user = user_crud.get(db, id=user_id)
+            user = _get_user(db, user_id)
             if not user:
                 raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid User")
         else:
@@ -65,8 +74,18 @@ def _authenticated_user(
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
 
+def _detached_authenticated_user(
+    authorization: str = Header(None, alias="Authorization")
+) -> User:
+    with session_scope() as db:
+        user, _ = _authenticated_user(db, authorization)
+    return user
+
+
 is_authorized = Annotated[bool, Depends(_authenticated)]
 authenticated_user = Annotated[Tuple[User, Session], Depends(_authenticated_user)]
+# the user without a DB session held open for the request, for long-lived handlers
+detached_authenticated_user = Annotated[User, Depends(_detached_authenticated_user)]
 
 
 async def _websocket_authenticated(db: get_db, websocket: WebSocket):
@@ -75,17 +94,13 @@ async def _websocket_authenticated(db: get_db, websocket: WebSocket):
         await websocket.close(code=403)
         raise WebSocketDisconnect(code=403)
 
-    payload = jwt.decode(
-        token,
-        Config.JWT_SECRET_KEY,
-        algorithms=[Config.JWT_ALGORITHM],
-    )
+    payload = token_cache.decode(token)
 
     user_id = payload["id"]
     if not user_id:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token")
 
-    user = user_crud.get(db, id=user_id)
+    user = _get_user(db, user_id)
 
     return user, db
 
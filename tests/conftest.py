@@ -27,7 +27,16 @@ from sqlalchemy.orm import Session
 from src.main import create_app
 
 # Factory imports
-from tests.factory import UserFactory
+from tests.factory import (
+    CategoryFactory,
+    ConversationFactory,
+    ConversationSessionFactory,
+    PlanFactory,
+    ReportFactory,
+    SubscriptionFactory,
+    TopicFactory,
+    UserFactory,
+)
 from utils.db.base import ModelBase
 from utils.db.session import get_db
 
@@ -134,6 +143,29 @@ def persistent_db_session(engine: Engine) -> Generator[Session, Any, None]:
     engine.dispose()
 
 
+@pytest.fixture(scope="function")
+def tables(engine: Engine) -> Generator[Engine, Any, None]:
+    """
+    Creates the tables for tests that commit outside of `app`, and drops them
+    at the end of the test.
+    """
+    ModelBase.metadata.create_all(bind=engine)
+
+    yield engine
+
+    engine.dispose()
+    ModelBase.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db(tables: Engine, persistent_db_session: Session) -> Session:
+    """
+    A `persistent_db_session` over freshly created tables, for tests that
+    commit and check what was written.
+    """
+    return persistent_db_session
+
+
 @pytest.fixture(scope="function")
 def app(engine: Engine) -> Generator[FastAPI, Any, None]:
     """
@@ -215,6 +247,13 @@ pytest.persist_object = persist_object
 
 # register factories
 register(UserFactory)
+register(PlanFactory)
+register(SubscriptionFactory)
+register(CategoryFactory)
+register(TopicFactory)
+register(ConversationSessionFactory)
+register(ConversationFactory)
+register(ReportFactory)
 
 
 @pytest.fixture
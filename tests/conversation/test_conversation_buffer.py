@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.conversation.utils import buffer
+from src.conversation.utils.buffer import ConversationBuffer
+
+
+class FlakyDatabase:
+    """A session factory whose first `failures` units of work fail."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.written = []
+
+    @asynccontextmanager
+    async def session(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database went away")
+        yield self
+
+
+async def add_many(db: FlakyDatabase, rows):
+    db.written.extend(rows)
+
+
+def test_failing_flush_keeps_the_rows(monkeypatch):
+    monkeypatch.setattr(buffer.conversation_crud, "add_many", add_many)
+    database = FlakyDatabase(failures=1)
+
+    async def run():
+        conversation = ConversationBuffer(
+            "session", "test", max_rows=2, session_factory=database.session
+        )
+        await conversation.add("user", "first")
+        await conversation.add("ai", "second")  # flush fails
+        assert database.written == []
+
+        await conversation.add("user", "third")
+        await conversation.flush()
+
+    asyncio.run(run())
+
+    assert [row["content"] for row in database.written] == ["first", "second", "third"]
+
+
+def test_failing_timer_flush_keeps_the_rows(monkeypatch):
+    monkeypatch.setattr(buffer.conversation_crud, "add_many", add_many)
+    database = FlakyDatabase(failures=1)
+
+    async def run():
+        conversation = ConversationBuffer(
+            "session", "test", interval=0.01, session_factory=database.session
+        )
+        await conversation.add("user", "first")
+        await asyncio.sleep(0.05)  # the timer's flush fails
+        assert database.written == []
+
+        await conversation.flush()
+
+    asyncio.run(run())
+
+    assert [row["content"] for row in database.written] == ["first"]
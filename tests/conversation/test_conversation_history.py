@@ -0,0 +1,64 @@
+import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.conversation.api import conversation_router
+from src.user.models import User
+from src.user.utils.deps import _authenticated_user
+from tests.factory import ReportFactory, TopicFactory
+
+SESSIONS = 7
+
+
+@pytest.fixture
+def history(db: Session, persisted_user: User):
+    """A client for a user with `SESSIONS` scored sessions, some started together."""
+    topic = TopicFactory(name="Travel")
+    start = datetime.datetime(2024, 1, 1)
+    db.add_all(
+        ReportFactory(
+            score=i,
+            session__user=persisted_user,
+            session__topic=topic,
+            session__total_time=i,
+            session__created_at=start + datetime.timedelta(minutes=i // 2),
+        )
+        for i in range(SESSIONS)
+    )
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(conversation_router)
+    app.dependency_overrides[_authenticated_user] = lambda: (persisted_user, db)
+    return TestClient(app)
+
+
+def test_pages_cover_every_session_once_newest_first(history: TestClient):
+    sessions, after = [], None
+    while True:
+        response = history.get("/history", params={"limit": 3, "after": after})
+        assert response.status_code == 200
+        sessions += response.json()
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            break
+
+    assert len(sessions) == SESSIONS
+    assert len({session["id"] for session in sessions}) == SESSIONS
+    # pairs of sessions share a start time, newer pairs come first
+    scores = [session["score"] for session in sessions]
+    assert sorted(scores) == list(range(SESSIONS))
+    assert [score // 2 for score in scores] == sorted(
+        (score // 2 for score in scores), reverse=True
+    )
+    assert {session["topic"] for session in sessions} == {"Travel"}
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "WyJ4Il0=", "WyIyMDI0LTAxLTAxIiwgMV0="])
+def test_invalid_cursor_is_a_bad_request(history: TestClient, cursor: str):
+    response = history.get("/history", params={"after": cursor})
+
+    assert response.status_code == 400
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.conversation.utils import communication
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+class FakeBuffer:
+    def __init__(self):
+        self.rows = []
+
+    async def add(self, role, content):
+        self.rows.append((role, content))
+
+
+@pytest.fixture
+def fake_services(monkeypatch):
+    replies = iter([ValueError("not JSON"), KeyError("text"), ("Hello there", 0.9)])
+
+    async def transcribe(audio):
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    async def reply(query):
+        return "Hi!"
+
+    async def synthesize(text):
+        return b"RIFF"
+
+    monkeypatch.setattr(communication, "transcribe_with_groq", transcribe)
+    monkeypatch.setattr(communication, "get_ai_response", reply)
+    monkeypatch.setattr(communication.tts, "synthesize", synthesize)
+
+
+def test_failed_transcription_skips_only_that_turn(fake_services, monkeypatch):
+    websocket, buffer = FakeWebSocket(), FakeBuffer()
+    monkeypatch.setattr(
+        communication.ConversationPipeline, "_start_scoring", lambda *args: None
+    )
+
+    async def respond():
+        pipeline = communication.ConversationPipeline(
+            websocket, buffer, datetime.now() + timedelta(minutes=1)
+        )
+        for _ in range(3):
+            await pipeline.turns.put(communication.Turn(b"audio"))
+        await pipeline.turns.put(None)
+        await pipeline._respond()
+
+    asyncio.run(respond())
+
+    errors = ["Error: Could not transcribe audio."] * 2
+    assert websocket.sent == [*errors, "Hi!", b"RIFF"]
+    assert buffer.rows == [("user", "Hello there"), ("ai", "Hi!")]
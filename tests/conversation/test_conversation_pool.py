@@ -0,0 +1,141 @@
+import asyncio
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.conversation.models import Conversation, Report
+from src.conversation.utils import communication
+from tests.factory import TopicFactory, UserFactory
+
+SESSIONS = 20
+POOL_SIZE = 2
+TURNS = 3
+
+SAMPLE_RATE = 16000
+SPEECH = (np.sin(np.arange(SAMPLE_RATE // 2) / 5) * 3000).astype("<i2").tobytes()
+SILENCE = np.zeros(SAMPLE_RATE, dtype="<i2").tobytes()
+
+
+class FakeWebSocket:
+    """Plays a few spoken turns, then disconnects."""
+
+    active = 0
+    peak_active = 0
+
+    def __init__(self):
+        self.messages = [
+            {"type": "websocket.receive", "bytes": chunk}
+            for _ in range(TURNS)
+            for chunk in (SPEECH, SILENCE)
+        ]
+        self.sent = []
+
+    async def accept(self):
+        FakeWebSocket.active += 1
+        FakeWebSocket.peak_active = max(FakeWebSocket.peak_active, self.active)
+
+    async def receive(self):
+        await asyncio.sleep(0.05)
+        if self.messages:
+            return self.messages.pop(0)
+        # let the last turn be answered before hanging up
+        await asyncio.sleep(0.5)
+        FakeWebSocket.active -= 1
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        FakeWebSocket.active -= 1
+
+
+@pytest.fixture
+def small_pool_engine(tables: Engine, monkeypatch):
+    """An async engine whose pool is much smaller than the number of sessions."""
+    small_engine = create_async_engine(
+        tables.url.set(drivername="postgresql+asyncpg"),
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    monkeypatch.setattr(
+        "utils.db.session.AsyncSessionLocal",
+        async_sessionmaker(bind=small_engine, autoflush=False, expire_on_commit=False),
+    )
+    return small_engine
+
+
+@pytest.fixture
+def fake_services(monkeypatch):
+    async def transcribe(audio):
+        await asyncio.sleep(0.05)
+        return "I think this topic is really interesting", 0
+
+    async def reply(query):
+        await asyncio.sleep(0.05)
+        return "Why do you think so?"
+
+    async def synthesize(text):
+        return b"RIFF"
+
+    monkeypatch.setattr(communication, "transcribe_with_groq", transcribe)
+    monkeypatch.setattr(communication, "get_ai_response", reply)
+    monkeypatch.setattr(communication.tts, "synthesize", synthesize)
+
+
+def test_concurrent_sessions_share_few_connections(
+    engine: Engine, small_pool_engine, fake_services
+):
+    with Session(engine) as db:
+        topic = TopicFactory(name="Travel")
+        users = UserFactory.build_batch(SESSIONS)
+        db.add_all([topic, *users])
+        db.commit()
+        topic_id = topic.id
+        for user in users:
+            db.refresh(user)
+        db.expunge_all()
+
+    checked_out = peak = 0
+
+    @event.listens_for(small_pool_engine.sync_engine, "checkout")
+    def _checkout(*args):
+        nonlocal checked_out, peak
+        checked_out += 1
+        peak = max(peak, checked_out)
+
+    @event.listens_for(small_pool_engine.sync_engine, "checkin")
+    def _checkin(*args):
+        nonlocal checked_out
+        checked_out -= 1
+
+    async def run_sessions():
+        await asyncio.gather(
+            *(
+                communication.websocket_conversation(
+                    FakeWebSocket(), user, topic_id, duration=1
+                )
+                for user in users
+            )
+        )
+        await small_pool_engine.dispose()
+
+    asyncio.run(run_sessions())
+
+    with Session(engine) as db:
+        assert db.query(Report).count() == SESSIONS
+        assert db.query(Conversation).count() == SESSIONS * TURNS * 2
+
+    assert FakeWebSocket.peak_active == SESSIONS
+    assert peak <= POOL_SIZE < SESSIONS
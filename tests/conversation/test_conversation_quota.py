@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Barrier
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.orm import Session
+
+from src.billing.models import Plan, Subscription
+from src.conversation.crud import conversation_crud
+from src.user.models import User
+from tests.factory import SubscriptionFactory
+
+ALLOWED = 5
+STARTS = 40
+
+
+@pytest.fixture
+def subscribed_user(db: Session, persisted_user: User) -> str:
+    subscription = SubscriptionFactory(
+        customer=persisted_user, plan__allowed_conversations=ALLOWED
+    )
+    pytest.persist_object(db, subscription)
+    return persisted_user.id
+
+
+def start(engine: Engine, user_id: str, barrier: Barrier):
+    with Session(engine) as db:
+        barrier.wait()
+        try:
+            return conversation_crud.check_conversation_permission(db, user_id)
+        except HTTPException as e:
+            return e.status_code
+
+
+def test_concurrent_starts_never_exceed_the_plan(engine: Engine, subscribed_user):
+    barrier = Barrier(STARTS)
+    with ThreadPoolExecutor(max_workers=STARTS) as executor:
+        results = list(
+            executor.map(
+                lambda _: start(engine, subscribed_user, barrier), range(STARTS)
+            )
+        )
+
+    assert sorted(r for r in results if r != 403) == list(range(ALLOWED))
+    assert results.count(403) == STARTS - ALLOWED
+    with Session(engine) as db:
+        assert db.get(User, subscribed_user).used_conversations == ALLOWED
+
+
+def test_new_period_resets_the_quota(db: Session, subscribed_user):
+    for left in reversed(range(ALLOWED)):
+        assert (
+            conversation_crud.check_conversation_permission(db, subscribed_user) == left
+        )
+    with pytest.raises(HTTPException) as exceeded:
+        conversation_crud.check_conversation_permission(db, subscribed_user)
+    assert exceeded.value.status_code == 403
+
+    subscription = db.query(Subscription).one()
+    subscription.current_period_end += timedelta(days=30)
+    db.commit()
+
+    assert (
+        conversation_crud.check_conversation_permission(db, subscribed_user)
+        == ALLOWED - 1
+    )
+
+
+def test_missing_subscription_is_forbidden(db: Session, subscribed_user):
+    db.query(Subscription).delete()
+    db.commit()
+
+    with pytest.raises(HTTPException) as forbidden:
+        conversation_crud.check_conversation_permission(db, subscribed_user)
+    assert forbidden.value.detail == "User does not have subscription"
+
+
+def test_zero_allowance_is_refused_at_a_new_period(db: Session, subscribed_user):
+    db.query(Plan).update({"allowed_conversations": 0})
+    subscription = db.query(Subscription).one()
+    subscription.current_period_end += timedelta(days=30)
+    db.commit()
+
+    with pytest.raises(HTTPException) as exceeded:
+        conversation_crud.check_conversation_permission(db, subscribed_user)
+    assert exceeded.value.status_code == 403
+    assert db.get(User, subscribed_user).used_conversations == 0
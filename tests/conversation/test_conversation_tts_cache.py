@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from src.conversation.utils import tts_cache
+from src.conversation.utils.tts_cache import SpeechCache
+
+
+def files(directory) -> list:
+    return sorted(os.listdir(directory))
+
+
+def test_rewriting_a_key_counts_its_size_once(tmp_path):
+    cache = SpeechCache(str(tmp_path), memory_bytes=0, disk_bytes=10_000)
+    cache.put("a", b"x" * 450)
+    cache.put("a", b"x" * 300)
+    cache.put("b", b"x" * 450)
+
+    assert cache._disk_usage == 750
+    assert cache._disk_usage == sum(
+        os.path.getsize(tmp_path / f) for f in files(tmp_path)
+    )
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = SpeechCache(str(tmp_path), memory_bytes=0)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tts_cache.os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.put("a", b"RIFF")
+
+    assert files(tmp_path) == []
+
+
+def test_usage_is_rescanned_before_evicting(tmp_path):
+    cache = SpeechCache(str(tmp_path), memory_bytes=0, disk_bytes=1000)
+    cache.put("a", b"x" * 600)
+    # another worker evicts it, this worker's count is now too high
+    os.remove(tmp_path / "a.wav")
+
+    cache.put("b", b"x" * 600)
+
+    assert files(tmp_path) == ["b.wav"]
+    assert cache._disk_usage == 600
+
+
+def test_other_workers_files_are_counted_after_a_while(tmp_path):
+    worker, other = (
+        SpeechCache(str(tmp_path), memory_bytes=0, disk_bytes=1000) for _ in range(2)
+    )
+    worker.put("a", b"x" * 400)
+    os.utime(tmp_path / "a.wav", (0, 0))
+    other.put("b", b"x" * 400)
+    worker.rescan_seconds = 0
+
+    worker.put("c", b"x" * 400)
+
+    # the least recently used file makes room
+    assert files(tmp_path) == ["b.wav", "c.wav"]
+    assert worker._disk_usage == 800
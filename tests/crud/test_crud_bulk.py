@@ -0,0 +1,111 @@
+import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.category.models import Category, TopicLeaderboard
+from src.conversation.models import Conversation, ConversationSession
+from utils.crud.base import CRUDBase
+
+# values COPY's CSV format and executemany must round-trip unchanged
+CONTENTS = [
+    'she said "hi"',
+    "line one\nline two\r\n",
+    "a, b, c",
+    "back\\slash \\N",
+    "",
+    None,
+    '"',
+    "ünïcödé ✓",
+]
+
+
+@pytest.fixture
+def session_id(db: Session, conversation_session_factory) -> str:
+    return pytest.persist_object(db, conversation_session_factory()).id
+
+
+def turns(session_id: str) -> list:
+    return [
+        {
+            "role": "user",
+            "content": content,
+            "session_id": session_id,
+            "created_by": "t",
+            "updated_by": "t",
+        }
+        for content in CONTENTS
+    ]
+
+
+@pytest.mark.parametrize("method", ["bulk_copy", "bulk_insert"])
+def test_values_round_trip(db: Session, session_id: str, method: str):
+    crud = CRUDBase(Conversation)
+    written = getattr(crud, method)(db, turns(session_id), chunk_size=3)
+
+    assert written == len(CONTENTS)
+    rows = db.query(Conversation).all()
+    assert sorted((row.content for row in rows), key=repr) == sorted(CONTENTS, key=repr)
+    # the Python side column defaults are filled in
+    assert all(row.id and row.created_at and row.is_deleted is False for row in rows)
+    assert len({row.id for row in rows}) == len(CONTENTS)
+
+
+def test_bulk_copy_writes_dates_and_booleans(db: Session):
+    day = datetime.datetime(2024, 2, 29, 13, 45, 30, 123456)
+    CRUDBase(Category).bulk_copy(
+        db,
+        [
+            {
+                "name": "General",
+                "created_at": day,
+                "is_deleted": True,
+                "created_by": "t",
+                "updated_by": "t",
+            }
+        ],
+    )
+
+    category = db.query(Category).one()
+    assert (category.created_at, category.is_deleted) == (day, True)
+    assert category.description is None
+
+
+def test_add_all_returns_loaded_objects(db: Session, session_id: str):
+    objs = CRUDBase(Conversation).add_all(db, objs_in=turns(session_id), chunk_size=3)
+
+    assert [obj.content for obj in objs] == CONTENTS
+    assert all(obj.id for obj in objs)
+
+
+def test_bulk_insert_upserts_on_the_key(db: Session, session_id: str):
+    session = db.get(ConversationSession, session_id)
+    user_id, topic = session.user_id, session.topic
+    crud = CRUDBase(TopicLeaderboard)
+    row = {
+        "topic_id": topic.id,
+        "user_id": user_id,
+        "created_by": "first",
+        "updated_by": "first",
+    }
+    key = ["topic_id", "user_id"]
+
+    crud.bulk_insert(db, [{**row, "best_score": 5.0}], on_conflict=key)
+    first = db.query(TopicLeaderboard).one()
+    first_id, first_updated_at = first.id, first.updated_at
+
+    crud.bulk_insert(
+        db,
+        [{**row, "best_score": 7.0, "created_by": "second", "updated_by": "second"}],
+        on_conflict=key,
+    )
+    db.expire_all()
+    upserted = db.query(TopicLeaderboard).one()
+    assert (upserted.id, upserted.best_score) == (first_id, 7.0)
+    # creation audit columns are kept, update ones overwritten
+    assert (upserted.created_by, upserted.updated_by) == ("first", "second")
+    assert upserted.updated_at > first_updated_at
+
+    crud.bulk_insert(db, [{**row, "best_score": 1.0}], on_conflict=key, update=[])
+    db.expire_all()
+    assert db.query(TopicLeaderboard).one().best_score == 7.0
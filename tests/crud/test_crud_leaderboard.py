@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.category.crud import leaderboard_crud
+from src.category.models import Topic, TopicLeaderboard
+from src.category.utils.leaderboard import LeaderboardEntry, leaderboard_cache
+from src.user.models import User
+from tests.factory import ConversationFactory, ReportFactory, UserFactory
+
+YESTERDAY = datetime.datetime.now() - datetime.timedelta(days=1)
+
+
+@pytest.fixture
+def persisted_topic(db: Session, topic: Topic) -> Topic:
+    return pytest.persist_object(db, topic)
+
+
+def add_user(db: Session) -> User:
+    return pytest.persist_object(db, UserFactory())
+
+
+def add_report(db: Session, user: User, topic: Topic, score: float, spoke=True):
+    report = ReportFactory(session__user=user, session__topic=topic, score=score)
+    turns = [("ai", "Hi!"), ("user", "Hello")] if spoke else [("ai", "Hi!")]
+    for role, content in turns:
+        db.add(ConversationFactory(role=role, content=content, session=report.session))
+    db.add(report)
+
+
+def add_entry(db: Session, user: User, topic: Topic, best_score: float):
+    db.add(
+        TopicLeaderboard(
+            topic_id=topic.id,
+            user_id=user.id,
+            best_score=best_score,
+            updated_at=YESTERDAY,
+            created_by="t",
+            updated_by="t",
+        )
+    )
+
+
+def board(db: Session, topic: Topic) -> dict:
+    db.expire_all()
+    return {
+        entry.user_id: entry
+        for entry in db.query(TopicLeaderboard).filter_by(topic_id=topic.id)
+    }
+
+
+def test_rebuild_updates_stale_scores(db: Session, persisted_topic: Topic):
+    user = add_user(db)
+    add_report(db, user, persisted_topic, 6.5)
+    add_report(db, user, persisted_topic, 4.0)
+    add_entry(db, user, persisted_topic, 9.0)
+    db.commit()
+
+    leaderboard_crud.rebuild(db, created_by="rescore")
+
+    entry = board(db, persisted_topic)[user.id]
+    assert entry.best_score == 6.5
+    assert entry.updated_at > YESTERDAY
+    assert entry.updated_by == "rescore"
+
+
+def test_rebuild_removes_entries_without_reports(db: Session, persisted_topic: Topic):
+    kept = add_user(db)
+    add_report(db, kept, persisted_topic, 5.0)
+    gone = add_user(db)
+    for user in (kept, gone):
+        add_entry(db, user, persisted_topic, 3.0)
+    db.commit()
+
+    leaderboard_crud.rebuild(db)
+
+    assert set(board(db, persisted_topic)) == {kept.id}
+
+
+def test_rebuild_skips_sessions_without_turns(db: Session, persisted_topic: Topic):
+    silent = add_user(db)
+    add_report(db, silent, persisted_topic, 0.0, spoke=False)
+    mixed = add_user(db)
+    add_report(db, mixed, persisted_topic, 2.0)
+    add_report(db, mixed, persisted_topic, 0.0, spoke=False)
+    db.commit()
+
+    leaderboard_crud.rebuild(db)
+
+    entries = board(db, persisted_topic)
+    assert set(entries) == {mixed.id}
+    assert entries[mixed.id].best_score == 2.0
+
+
+def test_rebuild_drops_the_cached_boards(db: Session, persisted_topic: Topic):
+    user = add_user(db)
+    add_report(db, user, persisted_topic, 4.0)
+    db.commit()
+    leaderboard_cache.put(
+        persisted_topic.id, [LeaderboardEntry(9.0, user.id, "Stale score")]
+    )
+
+    leaderboard_crud.rebuild(db)
+
+    assert leaderboard_cache.get(persisted_topic.id) is None
@@ -0,0 +1,100 @@
+import base64
+import datetime
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.category.crud import topic_crud
+from src.category.models import Category
+from tests.factory import CategoryFactory, TopicFactory
+from utils.crud.base import CRUDBase, decode_cursor, encode_cursor
+
+category_crud = CRUDBase(Category)
+CREATED_AT = datetime.datetime(2024, 1, 1, 12, 0, 0, 250)
+
+
+def add_categories(db: Session, count: int, created_at=CREATED_AT) -> list:
+    categories = [CategoryFactory(created_at=created_at) for _ in range(count)]
+    db.add_all(categories)
+    db.commit()
+    return [category.id for category in categories]
+
+
+def all_pages(db: Session, limit: int, **kwargs) -> list:
+    pages, after = [], None
+    while True:
+        page, after = category_crud.get_page(db, limit=limit, after=after, **kwargs)
+        pages.append([category.id for category in page])
+        if after is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    keys = category_crud.page_keys(["created_at"])
+    cursor = encode_cursor([CREATED_AT, "some-id"])
+
+    assert decode_cursor(cursor, keys) == [CREATED_AT, "some-id"]
+
+
+def test_equal_sort_keys_are_ordered_by_id(db: Session):
+    # every row has the same created_at, the id alone tells the pages apart
+    ids = add_categories(db, 7)
+
+    pages = all_pages(db, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == sorted(ids)
+    pages = all_pages(db, limit=3, descending=True)
+    assert sum(pages, []) == sorted(ids, reverse=True)
+
+
+def test_last_page_has_no_cursor(db: Session):
+    add_categories(db, 4)
+
+    page, after = category_crud.get_page(db, limit=4)
+    assert len(page) == 4 and after is None
+
+    page, after = category_crud.get_page(db, limit=10)
+    assert len(page) == 4 and after is None
+
+
+def test_custom_sort_keys(db: Session):
+    add_categories(db, 5)
+
+    pages = all_pages(db, limit=2, order_by=["name"], descending=True)
+
+    names = [db.get(Category, id).name for id in sum(pages, [])]
+    assert names == sorted(names, reverse=True)
+
+
+def encoded(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encoded({"created_at": "2024-01-01"}),
+        encoded(["2024-01-01T12:00:00"]),  # a key missing
+        encoded(["yesterday", "some-id"]),
+        encoded(["2024-01-01T12:00:00", 42]),  # an id that is not a string
+        encoded(["2024-01-01T12:00:00", None]),
+    ],
+)
+def test_invalid_cursor_is_rejected(db: Session, cursor: str):
+    with pytest.raises(ValueError):
+        category_crud.get_page(db, after=cursor)
+
+
+def test_topics_without_a_limit_are_not_paged(db: Session):
+    category = CategoryFactory(name="General")
+    db.add_all(TopicFactory.build_batch(25, category=category))
+    db.commit()
+
+    topics, after = topic_crud.get_with_scores(db, "no-user", limit=None)
+    assert len(topics) == 25 and after is None
+
+    topics, after = topic_crud.get_with_scores(db, "no-user", "General", limit=20)
+    assert len(topics) == 20 and after is not None
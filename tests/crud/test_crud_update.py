@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.orm import Session
+
+from src.category.models import Category
+from tests.factory import CategoryFactory
+from utils.crud.base import CRUDBase
+
+category_crud = CRUDBase(Category)
+
+
+@pytest.fixture
+def statements(engine: Engine) -> list:
+    executed = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    return executed
+
+
+def add_categories(db: Session, *names: str) -> list:
+    categories = [CategoryFactory(name=name, description=name) for name in names]
+    db.add_all(categories)
+    db.commit()
+    for category in categories:
+        db.refresh(category)
+    return categories
+
+
+def updates(statements: list) -> list:
+    return [s for s in statements if s.startswith("UPDATE")]
+
+
+def test_update_writes_only_changed_columns(db: Session, statements: list):
+    (category,) = add_categories(db, "General")
+    updated_at = category.updated_at
+    statements.clear()
+
+    category_crud.update(
+        db,
+        db_obj=category,
+        obj_in={"name": "General", "description": "Everyday talk", "plan": "x"},
+    )
+
+    (statement,) = updates(statements)
+    set_clause = statement.split(" SET ")[1].split(" WHERE ")[0]
+    assert "description" in set_clause and "name" not in set_clause
+    # onupdate still stamps the row
+    assert "updated_at" in set_clause
+    db.refresh(category)
+    assert category.description == "Everyday talk"
+    assert category.updated_at > updated_at
+
+
+def test_update_without_changes_writes_nothing(db: Session, statements: list):
+    (category,) = add_categories(db, "General")
+    statements.clear()
+
+    category_crud.update(
+        db, db_obj=category, obj_in={"name": "General", "description": "General"}
+    )
+
+    assert updates(statements) == []
+
+
+def test_bulk_update(db: Session, statements: list):
+    first, second, untouched = add_categories(db, "One", "Two", "Three")
+    before = {c.id: c.updated_at for c in (first, second, untouched)}
+    statements.clear()
+
+    count = category_crud.bulk_update(
+        db,
+        [first.id, second.id, "missing"],
+        {"description": "bulk", "updated_by": "admin"},
+    )
+
+    assert count == 2
+    assert len(updates(statements)) == 1
+    db.expire_all()
+    for category in (first, second):
+        assert (category.description, category.updated_by) == ("bulk", "admin")
+        assert category.updated_at > before[category.id]
+    assert (untouched.description, untouched.updated_at) == (
+        "Three",
+        before[untouched.id],
+    )
+
+
+def test_bulk_update_rejects_unknown_columns(db: Session):
+    (category,) = add_categories(db, "General")
+
+    with pytest.raises(ValueError):
+        category_crud.bulk_update(db, [category.id], {"topic": "x"})
@@ -1,7 +1,12 @@
+from datetime import datetime, timedelta
+
 import factory
 from faker import Factory as FakerFactory
 from pytest_factoryboy import register
 
+from src.billing.models import Plan, Subscription
+from src.category.models import Category, Topic
+from src.conversation.models import Conversation, ConversationSession, Report
 from src.user.models import User, UserRoles
 
 faker = FakerFactory.create()
@@ -16,19 +21,125 @@ class UserFactory(factory.Factory):
 
     firstname = factory.LazyFunction(faker.first_name)
     lastname = factory.LazyFunction(faker.last_name)
-    image_url = factory.LazyFunction(faker.image_url)
 
-    email = factory.LazyFunction(faker.safe_email)
-    phone_number_country_code = "+1"
-    phone_number = factory.LazyAttribute(
-        lambda x: faker.pyint(999_999_999, 10_000_000_000)
-    )
+    email = factory.Sequence(lambda n: f"user{n}@demo.com")
 
     password = factory.LazyFunction(faker.password)
 
     role = UserRoles.USER.value
     email_verified = True
-    phone_number_verified = True
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class PlanFactory(factory.Factory):
+    """Plan Factory"""
+
+    class Meta:
+        model = Plan
+
+    name = factory.Sequence(lambda n: f"Plan {n}")
+    product_id = factory.Sequence(lambda n: f"prod_{n}")
+    price_id = factory.Sequence(lambda n: f"price_{n}")
+    amount = 10
+    allowed_conversations = 5
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class SubscriptionFactory(factory.Factory):
+    """Subscription Factory"""
+
+    class Meta:
+        model = Subscription
+
+    subscription_id = factory.Sequence(lambda n: f"sub_{n}")
+    status = "active"
+    current_period_end = factory.LazyFunction(
+        lambda: datetime.now() + timedelta(days=30)
+    )
+    customer = factory.SubFactory(UserFactory)
+    plan = factory.SubFactory(PlanFactory)
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class CategoryFactory(factory.Factory):
+    """Category Factory"""
+
+    class Meta:
+        model = Category
+
+    name = factory.Sequence(lambda n: f"Category {n}")
+    description = factory.LazyFunction(faker.sentence)
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class TopicFactory(factory.Factory):
+    """Topic Factory"""
+
+    class Meta:
+        model = Topic
+
+    name = factory.Sequence(lambda n: f"Topic {n}")
+    description = factory.LazyFunction(faker.sentence)
+    category = factory.SubFactory(CategoryFactory)
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class ConversationSessionFactory(factory.Factory):
+    """Conversation Session Factory"""
+
+    class Meta:
+        model = ConversationSession
+
+    total_time = 1.0
+    user = factory.SubFactory(UserFactory)
+    topic = factory.SubFactory(TopicFactory)
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class ConversationFactory(factory.Factory):
+    """Conversation Factory"""
+
+    class Meta:
+        model = Conversation
+
+    role = "user"
+    content = factory.LazyFunction(faker.sentence)
+    session = factory.SubFactory(ConversationSessionFactory)
+
+    created_by = "SYSTEM_ADMIN"
+    updated_by = "SYSTEM_ADMIN"
+
+
+@register
+class ReportFactory(factory.Factory):
+    """Report Factory, the session's user must be persisted already"""
+
+    class Meta:
+        model = Report
+
+    score = 5.0
+    words_spoken = 10
+    session = factory.SubFactory(ConversationSessionFactory)
+    topic = factory.SelfAttribute("session.topic")
+    user_id = factory.LazyAttribute(lambda report: report.session.user.id)
 
     created_by = "SYSTEM_ADMIN"
     updated_by = "SYSTEM_ADMIN"
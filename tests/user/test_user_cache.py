@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from src.user.models import User
+from src.user.utils.cache import user_cache
+
+
+@pytest.fixture
+def cached_user(db: Session, persisted_user: User):
+    user_cache.invalidate()
+    user_cache.put(persisted_user)
+
+    yield persisted_user
+
+    user_cache.invalidate()
+
+
+def test_flushed_change_is_dropped_on_commit(db: Session, cached_user: User):
+    cached_user.is_banned = True
+    db.flush()
+
+    # another request may still read and cache the committed row meanwhile
+    assert user_cache.get(cached_user.id) is not None
+
+    db.commit()
+    assert user_cache.get(cached_user.id) is None
+
+
+def test_rolled_back_change_keeps_the_entry(db: Session, cached_user: User):
+    cached_user.is_banned = True
+    db.flush()
+    db.rollback()
+    db.commit()
+
+    assert user_cache.get(cached_user.id) is not None
+
+
+def test_savepoint_changes_are_dropped_with_the_transaction(
+    db: Session, cached_user: User
+):
+    with db.begin_nested():
+        cached_user.role = "admin"
+    assert user_cache.get(cached_user.id) is not None
+
+    db.commit()
+    assert user_cache.get(cached_user.id) is None
+
+
+def test_update_statement_drops_every_user(db: Session, cached_user: User):
+    db.execute(update(User).where(User.id == cached_user.id).values(is_active=False))
+    assert user_cache.get(cached_user.id) is not None
+
+    db.commit()
+    assert user_cache.get(cached_user.id) is None
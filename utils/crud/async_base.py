@@ -0,0 +1,168 @@
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import false
+
+from src.config import Config
+from utils.crud.base import (
+    CreateSchemaType,
+    CRUDBase,
+    ModelType,
+    RowData,
+    UpdateSchemaType,
+    bulk_update_statement,
+    chunked,
+    keyset_page,
+    keyset_query,
+    row_data,
+    set_changed_columns,
+    upsert_statement,
+)
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """`CRUDBase` for an `AsyncSession`, every query is awaited."""
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    calc_offset = staticmethod(CRUDBase.calc_offset)
+    page_keys = CRUDBase.page_keys
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.scalar(
+            select(self.model).where(
+                self.model.id == id, self.model.is_deleted == false()
+            )
+        )
+
+    async def get_deleted_also(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi(
+        self, db: AsyncSession, *, page: int = 1, per_page: int = 10
+    ) -> List[ModelType]:
+        result = await db.scalars(
+            select(self.model)
+            .where(self.model.is_deleted == false())
+            .offset(self.calc_offset(page, per_page))
+            .limit(per_page)
+        )
+        return list(result)
+
+    async def get_multi_deleted_also(
+        self, db: AsyncSession, *, page: int = 1, per_page: int = 10
+    ) -> List[ModelType]:
+        result = await db.scalars(
+            select(self.model).offset(self.calc_offset(page, per_page)).limit(per_page)
+        )
+        return list(result)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 10,
+        after: Optional[str] = None,
+        order_by: Sequence[str] = ("created_at",),
+        descending: bool = False,
+        deleted_also: bool = False,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        keys = self.page_keys(order_by)
+        query = select(self.model)
+        if not deleted_also:
+            query = query.where(self.model.is_deleted == false())
+        query = keyset_query(query, keys, limit, after, descending)
+        return keyset_page(await db.scalars(query), keys, limit)
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in, exclude_unset=True)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if set_changed_columns(db_obj, update_data):
+            db.add(db_obj)
+            await db.commit()
+        return db_obj
+
+    async def bulk_update(
+        self, db: AsyncSession, ids: Iterable[Any], values: Dict[str, Any]
+    ) -> int:
+        result = await db.execute(bulk_update_statement(self.model, ids, values))
+        await db.commit()
+        return result.rowcount
+
+    async def soft_del(self, db: AsyncSession, db_obj: ModelType):
+        db_obj.is_deleted = True
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def hard_del(self, db: AsyncSession, db_obj: ModelType) -> bool:
+        await db.delete(db_obj)
+        await db.commit()
+        return True
+
+    async def remove_by_id(self, db: AsyncSession, *, id: str) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def add_all(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[RowData],
+        chunk_size: int = Config.BULK_CHUNK_SIZE,
+    ) -> List[ModelType]:
+        db_objs = []
+        stmt = insert(self.model).returning(self.model)
+        for chunk in chunked(map(row_data, objs_in), chunk_size):
+            db_objs.extend(await db.scalars(stmt, chunk))
+        await db.commit()
+        return db_objs
+
+    async def bulk_insert(
+        self,
+        db: AsyncSession,
+        rows: Iterable[RowData],
+        *,
+        on_conflict: Optional[Sequence[str]] = None,
+        update: Optional[Sequence[str]] = None,
+        chunk_size: int = Config.BULK_CHUNK_SIZE,
+    ) -> int:
+        table = self.model.__table__
+        count = 0
+        for chunk in chunked(map(row_data, rows), chunk_size):
+            stmt = upsert_statement(table, chunk[0], on_conflict, update)
+            await db.execute(stmt, chunk)
+            count += len(chunk)
+        await db.commit()
+        return count
@@ -1,16 +1,236 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import binascii
+import datetime
+import io
+import json
+from enum import Enum
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Insert,
+    Row,
+    Select,
+    Table,
+    Update,
+    insert,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.orm.base import NO_VALUE
 from sqlalchemy.sql.expression import false
 
+from src.config import Config
 from utils.db.base import ModelBase
 
 ModelType = TypeVar("ModelType", bound=ModelBase)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+Keys = Sequence[InstrumentedAttribute]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime.date) else v for v in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: Keys) -> List[Any]:
+    """Raises `ValueError` if the cursor was not made by `encode_cursor` for `keys`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return [_cursor_value(key, value) for key, value in zip(keys, values)]
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _cursor_value(key: InstrumentedAttribute, value: Any) -> Any:
+    if isinstance(key.type, DateTime):
+        return datetime.datetime.fromisoformat(value)
+    if isinstance(key.type, Date):
+        return datetime.date.fromisoformat(value)
+    # a tampered cursor must not reach the database with the wrong type
+    try:
+        expected = key.type.python_type
+    except NotImplementedError:
+        return value
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, expected):
+        raise TypeError(f"{key.key} must be {expected.__name__}")
+    return value
+
+
+def keyset_query(
+    query: Select,
+    keys: Keys,
+    limit: int,
+    after: Optional[str] = None,
+    descending: bool = False,
+) -> Select:
+    """Orders `query` by `keys` and limits it to the page after the `after` cursor.
+
+    The keys must be non-null and unique together (end them with the primary
+    key). One extra row is fetched to tell whether there is a next page.
+    """
+    query = query.order_by(*(key.desc() if descending else key for key in keys))
+    if after:
+        row, cursor = tuple_(*keys), tuple_(*decode_cursor(after, keys))
+        query = query.where(row < cursor if descending else row > cursor)
+    return query.limit(limit + 1)
+
+
+def keyset_page(
+    rows: Sequence[Any], keys: Keys, limit: int
+) -> Tuple[list, Optional[str]]:
+    """Splits the rows of a `keyset_query` into the page and the next page's cursor.
+
+    Rows are either model instances, rows starting with one, or rows that
+    hold the keys as columns.
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, Row) and isinstance(last[0], ModelBase):
+        last = last[0]
+    return rows, encode_cursor([getattr(last, key.key) for key in keys])
+
+
+RowData = Union[Dict[str, Any], BaseModel]
+
+
+def row_data(obj: RowData) -> Dict[str, Any]:
+    return obj.model_dump(exclude_unset=True) if isinstance(obj, BaseModel) else obj
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def upsert_statement(
+    table: Table,
+    columns: Iterable[str],
+    on_conflict: Optional[Sequence[str]] = None,
+    update: Optional[Sequence[str]] = None,
+) -> Insert:
+    """A Postgres INSERT of `table`, with `ON CONFLICT (on_conflict)` when given.
+
+    On a conflict the `update` columns are overwritten with the new values, by
+    default every given column except the key and the creation audit columns,
+    plus `updated_at`. `update=[]` skips conflicting rows instead.
+    """
+    stmt = pg_insert(table)
+    if not on_conflict:
+        return stmt
+    if update is None:
+        kept = {*on_conflict, "id", "created_at", "created_by", "updated_at"}
+        update = [name for name in columns if name not in kept]
+        if update and "updated_at" in table.c:
+            update.append("updated_at")
+    if not update:
+        return stmt.on_conflict_do_nothing(index_elements=on_conflict)
+    return stmt.on_conflict_do_update(
+        index_elements=on_conflict,
+        set_={name: stmt.excluded[name] for name in update},
+    )
+
+
+def python_defaults(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """The row with the Python side column defaults filled in, as an INSERT would."""
+    row = dict(row)
+    for column in table.columns:
+        default = column.default
+        if column.name in row or default is None:
+            continue
+        if default.is_scalar:
+            row[column.name] = default.arg
+        elif default.is_callable:
+            row[column.name] = default.arg(None)
+    return row
+
+
+def csv_field(value: Any) -> str:
+    """A value of a `COPY ... (FORMAT csv)` row, an unquoted empty field is NULL."""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, (datetime.date, datetime.time)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=None)
+def column_keys(model: Type[ModelBase]) -> FrozenSet[str]:
+    """The mapped column attributes of a model, relationships excluded."""
+    return frozenset(attr.key for attr in inspect(model).column_attrs)
+
+
+def set_changed_columns(db_obj: ModelBase, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Sets the columns of `values` that differ from the loaded ones on `db_obj`.
+
+    Keys that are not columns are ignored and unloaded columns are not read,
+    so no lazy load is triggered. Returns the changed columns.
+    """
+    loaded = inspect(db_obj).dict
+    columns = column_keys(type(db_obj))
+    changed = {
+        key: value
+        for key, value in values.items()
+        if key in columns and loaded.get(key, NO_VALUE) != value
+    }
+    for key, value in changed.items():
+        setattr(db_obj, key, value)
+    return changed
+
+
+def bulk_update_statement(
+    model: Type[ModelBase], ids: Iterable[Any], values: Dict[str, Any]
+) -> Update:
+    unknown = set(values) - column_keys(model)
+    if unknown:
+        raise ValueError(f"{model.__name__} has no columns {sorted(unknown)}")
+    return (
+        update(model)
+        .where(model.id.in_(list(ids)))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
@@ -51,6 +271,32 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             .all()
         )
 
+    def page_keys(self, order_by: Sequence[str]) -> List[InstrumentedAttribute]:
+        keys = [getattr(self.model, name) for name in order_by]
+        if "id" not in order_by:
+            keys.append(self.model.id)
+        return keys
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        limit: int = 10,
+        after: Optional[str] = None,
+        order_by: Sequence[str] = ("created_at",),
+        descending: bool = False,
+        deleted_also: bool = False,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset pagination: returns `limit` rows after the `after` cursor and the
+        cursor of the next page, None on the last page.
+        """
+        keys = self.page_keys(order_by)
+        query = select(self.model)
+        if not deleted_also:
+            query = query.where(self.model.is_deleted == false())
+        query = keyset_query(query, keys, limit, after, descending)
+        return keyset_page(db.scalars(query).all(), keys, limit)
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in, exclude_unset=True)
         db_obj = self.model(**obj_in_data)
@@ -63,20 +309,29 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db: Session,
         *,
         db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj, exclude_unset=True)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
+        if set_changed_columns(db_obj, update_data):
+            db.add(db_obj)
+            db.commit()
         return db_obj
 
+    def bulk_update(
+        self, db: Session, ids: Iterable[Any], values: Dict[str, Any]
+    ) -> int:
+        """Sets `values` on every row of `ids` with one UPDATE, without loading them.
+
+        Loaded instances of these rows are not refreshed. Returns the number of
+        rows updated.
+        """
+        result = db.execute(bulk_update_statement(self.model, ids, values))
+        db.commit()
+        return result.rowcount
+
     def soft_del(self, db: Session, db_obj: ModelType):
         db_obj.is_deleted = True
         db.add(db_obj)
@@ -95,11 +350,76 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return obj
 
     def add_all(
-        self, db: Session, *, objs_in: List[CreateSchemaType]
+        self,
+        db: Session,
+        *,
+        objs_in: Iterable[RowData],
+        chunk_size: int = Config.BULK_CHUNK_SIZE,
     ) -> List[ModelType]:
-        db_objs = [
-            self.model(**jsonable_encoder(c, exclude_unset=True)) for c in objs_in
-        ]
-        db.add_all(db_objs)
+        """Inserts the objects with one multi-row INSERT ... RETURNING per chunk,
+        instead of flushing them one by one through the unit of work.
+        """
+        db_objs = []
+        stmt = insert(self.model).returning(self.model)
+        for chunk in chunked(map(row_data, objs_in), chunk_size):
+            db_objs.extend(db.scalars(stmt, chunk))
         db.commit()
         return db_objs
+
+    def bulk_insert(
+        self,
+        db: Session,
+        rows: Iterable[RowData],
+        *,
+        on_conflict: Optional[Sequence[str]] = None,
+        update: Optional[Sequence[str]] = None,
+        chunk_size: int = Config.BULK_CHUNK_SIZE,
+    ) -> int:
+        """Inserts or upserts (see `upsert_statement`) rows without loading them
+        as objects. All rows must have the same keys. Every chunk is one
+        executemany and all of them commit together.
+
+        Returns the number of rows sent.
+        """
+        table = self.model.__table__
+        count = 0
+        for chunk in chunked(map(row_data, rows), chunk_size):
+            stmt = upsert_statement(table, chunk[0], on_conflict, update)
+            db.execute(stmt, chunk)
+            count += len(chunk)
+        db.commit()
+        return count
+
+    def bulk_copy(
+        self,
+        db: Session,
+        rows: Iterable[RowData],
+        *,
+        chunk_size: int = Config.BULK_CHUNK_SIZE,
+    ) -> int:
+        """Loads new rows with `COPY ... FROM STDIN`, the fastest path into Postgres.
+
+        COPY has no ON CONFLICT, use `bulk_insert` to upsert. Returns the number
+        of rows copied.
+        """
+        table = self.model.__table__
+        columns = [column.name for column in table.columns]
+        sql = 'COPY "{}" ({}) FROM STDIN WITH (FORMAT csv)'.format(
+            table.name, ", ".join(f'"{name}"' for name in columns)
+        )
+        cursor = db.connection().connection.cursor()
+        count = 0
+        try:
+            for chunk in chunked(map(row_data, rows), chunk_size):
+                buffer = io.StringIO()
+                for row in chunk:
+                    row = python_defaults(table, row)
+                    buffer.write(",".join(csv_field(row.get(c)) for c in columns))
+                    buffer.write("\n")
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+                count += len(chunk)
+        finally:
+            cursor.close()
+        db.commit()
+        return count
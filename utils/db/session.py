@@ -1,8 +1,10 @@
-from typing import Annotated, Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Annotated, AsyncGenerator, AsyncIterator, Generator, Iterator
 
 from fastapi import Depends
 from sqlalchemy import create_engine
 from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config import Config
@@ -18,6 +20,20 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncpg-backed engine for async handlers, so they await queries instead of blocking the loop
+async_engine = create_async_engine(
+    Config.assemble_async_db_connection(),
+    pool_pre_ping=True,
+    pool_size=500,
+    max_overflow=100,
+    pool_recycle=60 * 60,
+    pool_timeout=30,
+)
+# objects are not expired on commit, reading an expired attribute would need implicit IO
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def _get_db() -> Generator:
     try:
@@ -34,3 +50,42 @@ def _get_db() -> Generator:
 
 
 get_db = Annotated[Session, Depends(_get_db)]
+
+
+async def _get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_async_db = Annotated[AsyncSession, Depends(_get_async_db)]
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """A short-lived unit of work for long-running handlers such as WebSockets.
+
+    The connection goes back to the pool as soon as the block ends instead of
+    staying checked out for the whole handler. Loaded objects are not expired
+    on commit, so they stay readable after the session is closed.
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """The async counterpart of `session_scope`."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
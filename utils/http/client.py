@@ -0,0 +1,91 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from src.config import Config
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HTTPClientPool:
+    """A keep-alive, connection-pooled async HTTP client shared by the worker.
+
+    The underlying `httpx.AsyncClient` is created lazily on first use so it binds
+    to the worker's event loop, and is closed on application shutdown.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.total_requests = 0
+        self.failed_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(
+                    Config.HTTP_READ_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT
+                ),
+                limits=httpx.Limits(
+                    max_connections=Config.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _track(self):
+        self.total_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        except httpx.HTTPError:
+            self.failed_requests += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        async with self._track():
+            return await self.client.post(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator:
+        async with self._track():
+            async with self.client.stream(method, url, **kwargs) as response:
+                yield response
+
+    def stats(self) -> dict:
+        """Pool usage counters, used to size the HTTP_* limits in the config."""
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "max_connections": Config.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "total_requests": self.total_requests,
+            "failed_requests": self.failed_requests,
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_pool = HTTPClientPool()